@@ -11,7 +11,9 @@ from flask import (
     redirect, 
     render_template, 
     request, 
-    send_file
+    Response,
+    send_file,
+    stream_with_context
 )
 from pymongo import MongoClient
 
@@ -38,12 +40,57 @@ db = mongo_client.wildlife_db
 
 # Constants
 ALLOWED_IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif'}
+STREAM_BATCH_SIZE = int(os.getenv('STREAM_BATCH_SIZE', '500'))
+NDJSON_MIMETYPE = 'application/x-ndjson'
 CACHE_HEADERS = {
     'Cache-Control': 'no-cache, no-store, must-revalidate, max-age=0',
     'Pragma': 'no-cache',
     'Expires': '0'
 }
 
+def generate_json_array(cursor):
+    """Yield a JSON array one cursor batch at a time"""
+    yield '['
+    separator = ''
+    batch = []
+    for doc in cursor:
+        batch.append(app.json.dumps(doc))
+        if len(batch) >= STREAM_BATCH_SIZE:
+            yield separator + ','.join(batch)
+            separator = ','
+            batch = []
+    if batch:
+        yield separator + ','.join(batch)
+    yield ']'
+
+def generate_ndjson(cursor):
+    """Yield newline-delimited JSON one cursor batch at a time"""
+    batch = []
+    for doc in cursor:
+        batch.append(app.json.dumps(doc))
+        if len(batch) >= STREAM_BATCH_SIZE:
+            yield '\n'.join(batch) + '\n'
+            batch = []
+    if batch:
+        yield '\n'.join(batch) + '\n'
+
+def start_cursor(cursor):
+    """Fetch the first batch now, so a failing query raises before the 200 and its headers are sent"""
+    first = next(cursor, None)
+
+    def documents():
+        if first is not None:
+            yield first
+            yield from cursor
+    return documents()
+
+def stream_documents(cursor):
+    """Stream a MongoDB cursor as a JSON array, or as NDJSON when the client asks for it"""
+    cursor = start_cursor(cursor.batch_size(STREAM_BATCH_SIZE))
+    if request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE:
+        return Response(stream_with_context(generate_ndjson(cursor)), mimetype=NDJSON_MIMETYPE)
+    return Response(stream_with_context(generate_json_array(cursor)), mimetype='application/json')
+
 def add_cache_headers(response):
     """Add no-cache headers to to response"""
     for key, value in CACHE_HEADERS.items():
@@ -118,8 +165,7 @@ def report_sighting():
 @app.route('/wildlife/api/sightings', methods=['GET'])
 def get_sightings():
     try:
-        sightings = list(db.sightings.find({}, {'_id': False}))
-        response = jsonify(sightings)
+        response = stream_documents(db.sightings.find({}, {'_id': False}))
         return add_cache_headers(response), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -162,11 +208,10 @@ def receive_gps():
 def get_gps_data():
     try:
         cutoff = datetime.utcnow() - timedelta(hours=24)
-        gps_data = list(db.gps_tracking.find(
+        response = stream_documents(db.gps_tracking.find(
             {"timestamp": {"$gt": cutoff}}, 
             {'_id': False}
         ))
-        response = jsonify(gps_data)
         return add_cache_headers(response), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -182,8 +227,7 @@ def data_health_check():
 @app.route('/wildlife/api/data/sightings', methods=['GET'])
 def data_get_sightings():
     try:
-        sightings = list(db.sightings.find({}, {'_id': False}))
-        return jsonify(sightings), 200
+        return stream_documents(db.sightings.find({}, {'_id': False}))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
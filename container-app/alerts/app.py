@@ -1,10 +1,25 @@
 # Alerts Service - Handles GPS tracking data and notifications for wildlife collars
 
-from datetime import datetime, timedelta
-from flask import Flask, jsonify, request
-from pymongo import MongoClient
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime, timedelta, timezone
+from flask import Flask, Response, jsonify, request, stream_with_context
+from pymongo import ASCENDING, DESCENDING, GEOSPHERE, MongoClient, UpdateOne
+from pymongo.errors import BulkWriteError, CollectionInvalid, DuplicateKeyError, OperationFailure
+from bson import ObjectId
+from bson.errors import InvalidId
+from gevent import get_hub, monkey
+import numpy as np
+import atexit
+import json
 import logging
+import math
+import os
+import queue
+import random
+import signal
+import threading
 import time
+import urllib.request
 from aws_xray_sdk.core import xray_recorder, patch_all
 from aws_xray_sdk.ext.flask.middleware import XRayMiddleware
 
@@ -26,58 +41,1696 @@ app = Flask(__name__)
 # Add X-Ray middleware to Flask
 XRayMiddleware(app, xray_recorder)
 
-# Simple retry mechanism: 60 attempts with 30-second delay (30 minutes total)
-def connect_with_retry(connect_func, service_name, max_attempts=60, delay=30):
+# Startup retry policy: exponential backoff with jitter until the deadline (30 minutes by default).
+# Only used while the service starts; request handlers never sleep on retries.
+STARTUP_RETRY_DEADLINE = float(os.getenv('STARTUP_RETRY_DEADLINE', '1800'))
+STARTUP_RETRY_MAX_DELAY = float(os.getenv('STARTUP_RETRY_MAX_DELAY', '30'))
+
+def connect_with_retry(connect_func, service_name, deadline=STARTUP_RETRY_DEADLINE, base_delay=1, max_delay=STARTUP_RETRY_MAX_DELAY):
     logger.info(f"Connecting to {service_name} with retry logic...")
-    
-    for attempt in range(max_attempts):
+    give_up_at = time.monotonic() + deadline
+    attempt = 0
+    while True:
+        attempt += 1
         try:
             result = connect_func()
-            logger.info(f"Successfully connected to {service_name} on attempt {attempt+1}")
+            logger.info(f"Successfully connected to {service_name} on attempt {attempt}")
             return result
         except Exception as e:
-            if attempt < max_attempts - 1:
-                logger.warning(f"Connection to {service_name} failed (attempt {attempt+1}/{max_attempts}): {str(e)}")
-                logger.info(f"Retrying in {delay} seconds...")
-                time.sleep(delay)
-            else:
-                logger.warning(f"Failed to connect to {service_name} after {max_attempts} attempts (30 minutes)")
+            backoff = min(max_delay, base_delay * 2 ** (attempt - 1))
+            delay = backoff / 2 + random.uniform(0, backoff / 2)
+            if time.monotonic() + delay > give_up_at:
+                logger.warning(f"Failed to connect to {service_name} after {attempt} attempts ({deadline:.0f} second deadline)")
                 raise
+            logger.warning(f"Connection to {service_name} failed (attempt {attempt}): {str(e)}")
+            logger.info(f"Retrying in {delay:.1f} seconds...")
+            time.sleep(delay)
+
+MONGO_URI = os.getenv('MONGO_URI', 'mongodb://wildlife-datadb.wildlife:27017')
+
+def connect_mongo():
+    """Create the MongoDB client and check the server is reachable (MongoClient itself connects lazily)"""
+    client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=5000)
+    try:
+        client.admin.command('ping')
+    except Exception:
+        client.close()
+        raise
+    return client
 
 # Initialize MongoDB client
 logger.info("Connecting to MongoDB")
 mongo_client = connect_with_retry(
-    lambda: MongoClient('mongodb://wildlife-datadb.wildlife:27017'),
+    connect_mongo,
     'MongoDB (wildlife-datadb)'
 )
 db = mongo_client.wildlife_db
 
+# Schema settings for gps_tracking
+GPS_TIMESERIES = os.getenv('GPS_TIMESERIES', 'false').lower() == 'true'
+GPS_META_FIELD = os.getenv('GPS_META_FIELD', 'animal_id')
+# Fixes expire this many seconds after their timestamp; 0 or empty keeps them forever
+GPS_TTL_SECONDS = int(os.getenv('GPS_TTL_SECONDS') or '0')
+
+def set_gps_ttl(timeseries):
+    """Apply GPS_TTL_SECONDS to the existing gps_tracking collection or index, turning expiry off at 0"""
+    if timeseries:
+        db.command('collMod', 'gps_tracking', expireAfterSeconds=GPS_TTL_SECONDS or 'off')
+    elif GPS_TTL_SECONDS:
+        db.command('collMod', 'gps_tracking', index={
+            'keyPattern': {'timestamp': ASCENDING},
+            'expireAfterSeconds': GPS_TTL_SECONDS
+        })
+    else:
+        # An index cannot drop its TTL in place, so rebuild it without one
+        logger.info("Removing the gps_tracking TTL")
+        db.gps_tracking.drop_index([('timestamp', ASCENDING)])
+        db.gps_tracking.create_index([('timestamp', ASCENDING)])
+
+def bootstrap_gps_schema():
+    """Create gps_tracking and the index backing the recent-fixes query"""
+    try:
+        if GPS_TIMESERIES and 'gps_tracking' not in db.list_collection_names():
+            logger.info(f"Creating gps_tracking as a time-series collection (metaField: {GPS_META_FIELD})")
+            options = {'timeseries': {'timeField': 'timestamp', 'metaField': GPS_META_FIELD, 'granularity': 'seconds'}}
+            if GPS_TTL_SECONDS:
+                options['expireAfterSeconds'] = GPS_TTL_SECONDS
+            try:
+                db.create_collection('gps_tracking', **options)
+            except CollectionInvalid:
+                # Another task created it first
+                pass
+
+        db.gps_tracking.create_index([('location', GEOSPHERE)])
+        # Delta sync walks fixes in the order they reached the service
+        db.gps_tracking.create_index([('received_at', ASCENDING)])
+        # Trajectories read each collar's fixes in time order
+        db.gps_tracking.create_index([(GPS_META_FIELD, ASCENDING), ('timestamp', ASCENDING)])
+        # Geofence alerts are read newest first, overall or per collar
+        db.geofence_alerts.create_index([('created_at', DESCENDING)])
+        db.geofence_alerts.create_index([('animal_id', ASCENDING), ('created_at', DESCENDING)])
+
+        if 'timeseries' in db.gps_tracking.options():
+            logger.info("gps_tracking is a time-series collection")
+            set_gps_ttl(True)
+            return
+
+        if GPS_TIMESERIES:
+            logger.warning("gps_tracking already exists as a regular collection, using a timestamp index instead")
+        logger.info("Ensuring gps_tracking timestamp index")
+        index_options = {'expireAfterSeconds': GPS_TTL_SECONDS} if GPS_TTL_SECONDS else {}
+        try:
+            db.gps_tracking.create_index([('timestamp', ASCENDING)], **index_options)
+        except OperationFailure:
+            # The index exists with a different TTL (or none), so update it
+            set_gps_ttl(False)
+    except Exception as e:
+        logger.warning(f"Failed to bootstrap gps_tracking schema: {str(e)}")
+
+bootstrap_gps_schema()
+
+# Geospatial query settings
+EARTH_RADIUS_METERS = 6378100
+DEFAULT_NEAR_RADIUS_METERS = float(os.getenv('DEFAULT_NEAR_RADIUS_METERS', '1000'))
+
+def parse_geo_query():
+    """Build a geospatial filter from the bbox or near/radius query parameters"""
+    if request.args.get('bbox'):
+        try:
+            min_lon, min_lat, max_lon, max_lat = [float(value) for value in request.args['bbox'].split(',')]
+        except ValueError:
+            raise ValueError("Invalid bbox")
+        if not (-180 <= min_lon < max_lon <= 180 and -90 <= min_lat < max_lat <= 90):
+            raise ValueError("Invalid bbox")
+        ring = [[min_lon, min_lat], [max_lon, min_lat], [max_lon, max_lat], [min_lon, max_lat], [min_lon, min_lat]]
+        return {"location": {"$geoWithin": {"$geometry": {"type": "Polygon", "coordinates": [ring]}}}}
+
+    if request.args.get('near'):
+        try:
+            lon, lat = [float(value) for value in request.args['near'].split(',')]
+            radius = float(request.args.get('radius', DEFAULT_NEAR_RADIUS_METERS))
+        except ValueError:
+            raise ValueError("Invalid near or radius")
+        if not (-180 <= lon <= 180 and -90 <= lat <= 90 and radius > 0):
+            raise ValueError("Invalid near or radius")
+        # $centerSphere takes its radius in radians
+        return {"location": {"$geoWithin": {"$centerSphere": [[lon, lat], radius / EARTH_RADIUS_METERS]}}}
+
+    return {}
+
+GPS_MAX_LIMIT = int(os.getenv('GPS_MAX_LIMIT', '10000'))
+
+def add_gps_location(fix):
+    """Store a GeoJSON point alongside latitude/longitude so the 2dsphere index covers the fix"""
+    try:
+        lat = float(fix['latitude'])
+        lon = float(fix['longitude'])
+    except (KeyError, TypeError, ValueError):
+        return
+    if -90 <= lat <= 90 and -180 <= lon <= 180:
+        fix['location'] = {"type": "Point", "coordinates": [lon, lat]}
+
+# Streaming settings
+STREAM_BATCH_SIZE = int(os.getenv('STREAM_BATCH_SIZE', '500'))
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+def generate_json_array(cursor):
+    """Yield a JSON array one cursor batch at a time"""
+    yield '['
+    separator = ''
+    batch = []
+    for doc in cursor:
+        batch.append(app.json.dumps(doc))
+        if len(batch) >= STREAM_BATCH_SIZE:
+            yield separator + ','.join(batch)
+            separator = ','
+            batch = []
+    if batch:
+        yield separator + ','.join(batch)
+    yield ']'
+
+def generate_ndjson(cursor):
+    """Yield newline-delimited JSON one cursor batch at a time"""
+    batch = []
+    for doc in cursor:
+        batch.append(app.json.dumps(doc))
+        if len(batch) >= STREAM_BATCH_SIZE:
+            yield '\n'.join(batch) + '\n'
+            batch = []
+    if batch:
+        yield '\n'.join(batch) + '\n'
+
+def start_cursor(cursor):
+    """Fetch the first batch now, so a failing query raises before the 200 and its headers are sent"""
+    first = next(cursor, None)
+
+    def documents():
+        if first is not None:
+            yield first
+            yield from cursor
+    return documents()
+
+def stream_documents(cursor):
+    """Stream a MongoDB cursor as a JSON array, or as NDJSON when the client asks for it"""
+    cursor = start_cursor(cursor.batch_size(STREAM_BATCH_SIZE))
+    if request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE:
+        return Response(stream_with_context(generate_ndjson(cursor)), mimetype=NDJSON_MIMETYPE)
+    return Response(stream_with_context(generate_json_array(cursor)), mimetype='application/json')
+
+# Bulk ingestion settings
+GPS_BULK_CHUNK_SIZE = int(os.getenv('GPS_BULK_CHUNK_SIZE', '1000'))
+GPS_BULK_MAX_ITEMS = int(os.getenv('GPS_BULK_MAX_ITEMS', '50000'))
+GPS_BULK_MAX_BYTES = int(os.getenv('GPS_BULK_MAX_BYTES', str(32 * 1024 * 1024)))
+# Collar clocks drift a little; anything further ahead than this is a bad clock, not a fix from the future
+GPS_MAX_CLOCK_SKEW = float(os.getenv('GPS_MAX_CLOCK_SKEW', '300'))
+
+def read_bulk_body():
+    """Read the request body, giving up past GPS_BULK_MAX_BYTES even when no Content-Length was sent"""
+    chunks = []
+    size = 0
+    while True:
+        chunk = request.stream.read(64 * 1024)
+        if not chunk:
+            return b''.join(chunks).decode()
+        size += len(chunk)
+        if size > GPS_BULK_MAX_BYTES:
+            return None
+        chunks.append(chunk)
+
+def parse_bulk_body(body):
+    """Parse a JSON array or NDJSON request body into a list of (index, item, error) tuples"""
+    if request.mimetype == NDJSON_MIMETYPE:
+        items = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                items.append((len(items), json.loads(line), None))
+            except ValueError:
+                items.append((len(items), None, "Invalid JSON"))
+        return items
+
+    data = json.loads(body)
+    if not isinstance(data, list):
+        raise ValueError("Expected a JSON array of GPS fixes")
+    return [(index, item, None) for index, item in enumerate(data)]
+
+def parse_timestamp(value):
+    """Parse an ISO 8601 timestamp into naive UTC, matching datetime.utcnow()"""
+    try:
+        timestamp = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        raise ValueError("Invalid timestamp")
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp
+
+def validate_gps_fix(item):
+    """Validate and normalize a single GPS fix, returning the document to store"""
+    if not isinstance(item, dict):
+        raise ValueError("GPS fix must be an object")
+    fix = dict(item)
+    for coord, limit in (('latitude', 90), ('longitude', 180)):
+        if coord not in fix:
+            raise ValueError(f"Missing {coord}")
+        try:
+            fix[coord] = float(fix[coord])
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid {coord}")
+        if not -limit <= fix[coord] <= limit:
+            raise ValueError(f"Invalid {coord}")
+    # Backlogged fixes keep the collar's own timestamp when it sends one
+    fix['received_at'] = datetime.utcnow()
+    if 'timestamp' in fix:
+        fix['timestamp'] = parse_timestamp(fix['timestamp'])
+        if fix['timestamp'] > fix['received_at'] + timedelta(seconds=GPS_MAX_CLOCK_SKEW):
+            raise ValueError("Timestamp is in the future")
+    else:
+        fix['timestamp'] = fix['received_at']
+    add_gps_location(fix)
+    return fix
+
+@xray_recorder.capture('gps_bulk_insert')
+def insert_gps_chunk(chunk):
+    """Insert a chunk of (index, document) pairs unordered, returning per-item errors"""
+    errors = []
+    try:
+        db.gps_tracking.insert_many([doc for _, doc in chunk], ordered=False)
+    except BulkWriteError as e:
+        for write_error in e.details.get('writeErrors', []):
+            errors.append({"index": chunk[write_error['index']][0], "error": write_error.get('errmsg', 'Write failed')})
+    return errors
+
+@app.route('/wildlife/api/gps/bulk', methods=['POST'])
+def receive_gps_bulk():
+    try:
+        logger.info("Receiving bulk GPS data")
+        # Checked up front when declared; chunked bodies are cut off by read_bulk_body instead
+        if request.content_length and request.content_length > GPS_BULK_MAX_BYTES:
+            return jsonify({"error": "Request body too large"}), 413
+
+        try:
+            body = read_bulk_body()
+            if body is None:
+                return jsonify({"error": "Request body too large"}), 413
+            items = parse_bulk_body(body)
+        except ValueError as e:
+            logger.warning(f"Invalid bulk GPS body: {str(e)}")
+            return jsonify({"error": str(e)}), 400
+        if len(items) > GPS_BULK_MAX_ITEMS:
+            return jsonify({"error": f"Too many GPS fixes (max {GPS_BULK_MAX_ITEMS})"}), 413
+
+        errors = []
+        valid = []
+        for index, item, error in items:
+            if error is None:
+                try:
+                    valid.append((index, validate_gps_fix(item)))
+                    continue
+                except ValueError as e:
+                    error = str(e)
+            errors.append({"index": index, "error": error})
+
+        for start in range(0, len(valid), GPS_BULK_CHUNK_SIZE):
+            chunk = valid[start:start + GPS_BULK_CHUNK_SIZE]
+            try:
+                chunk_errors = insert_gps_chunk(chunk)
+            except Exception as e:
+                # Earlier chunks are already stored, so report what failed rather than a bare 500
+                # that would make the client resend (and duplicate) them
+                logger.error(f"Bulk GPS insert failed after {start} fixes: {str(e)}")
+                errors.extend({"index": index, "error": f"Write failed: {str(e)}"} for index, _ in chunk)
+                errors.extend({"index": index, "error": "Not attempted after an earlier write failure"}
+                              for index, _ in valid[start + GPS_BULK_CHUNK_SIZE:])
+                break
+            failed = {error['index'] for error in chunk_errors}
+            track_gps_fixes([doc for index, doc in chunk if index not in failed])
+            errors.extend(chunk_errors)
+
+        errors.sort(key=lambda error: error['index'])
+        logger.info(f"Bulk GPS data received: {len(items) - len(errors)}/{len(items)} fixes stored")
+        return jsonify({
+            "received": len(items),
+            "inserted": len(items) - len(errors),
+            "errors": errors
+        }), 207 if errors else 200
+    except Exception as e:
+        logger.error(f"Error receiving bulk GPS data: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+## Geofences: zone entry/exit alerts evaluated as fixes arrive
+
+# Zones (reserve boundary, villages, buffered roads) are polygons in the geofences collection, held in
+# memory behind a uniform grid so each fix is only tested against the few zones sharing its cell
+GEOFENCE_GRID_DEGREES = float(os.getenv('GEOFENCE_GRID_DEGREES', '0.01'))
+GEOFENCE_REFRESH_SECONDS = float(os.getenv('GEOFENCE_REFRESH_SECONDS', '60'))
+# Zones spanning more grid cells than this are kept out of the grid and tested by bounding box instead,
+# so index size no longer grows with the square of a zone's width
+GEOFENCE_MAX_ZONE_CELLS = int(os.getenv('GEOFENCE_MAX_ZONE_CELLS', '2500'))
+# Largest zone width or height accepted, in degrees (a reserve, not a country)
+GEOFENCE_MAX_EXTENT_DEGREES = float(os.getenv('GEOFENCE_MAX_EXTENT_DEGREES', '5'))
+# Cached collar state is re-read after this long, since other workers may have moved it on
+GEOFENCE_STATE_TTL = float(os.getenv('GEOFENCE_STATE_TTL', '30'))
+GEOFENCE_WEBHOOK_URL = os.getenv('GEOFENCE_WEBHOOK_URL', '')
+GEOFENCE_WEBHOOK_QUEUE = int(os.getenv('GEOFENCE_WEBHOOK_QUEUE', '1000'))
+GEOFENCE_KINDS = {'reserve', 'village', 'road', 'other'}
+# Point-in-polygon broadcasts are chunked to keep points x edges near this many cells
+GEOFENCE_CHUNK_CELLS = 1000000
+
+def ring_contains(edges, xs, ys):
+    """Even-odd test of many points against one ring, vectorized over points and edges"""
+    x1, y1, x2, y2 = edges
+    inside = np.empty(len(xs), dtype=bool)
+    step = max(1, GEOFENCE_CHUNK_CELLS // len(x1))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for start in range(0, len(xs), step):
+            px = xs[start:start + step, None]
+            py = ys[start:start + step, None]
+            # Horizontal edges divide by zero, but never straddle py so they are masked out
+            crosses = (y1 > py) != (y2 > py)
+            x_at = x1 + (py - y1) * (x2 - x1) / (y2 - y1)
+            inside[start:start + step] = np.count_nonzero(crosses & (px < x_at), axis=1) % 2 == 1
+    return inside
+
+class GeofenceZone:
+    """A Polygon or MultiPolygon zone with its rings stored as NumPy edge arrays"""
+    __slots__ = ('id', 'name', 'kind', 'bbox', 'polygons')
+
+    def __init__(self, zone_id, name, kind, geometry):
+        if geometry.get('type') == 'Polygon':
+            polygons = [geometry['coordinates']]
+        elif geometry.get('type') == 'MultiPolygon':
+            polygons = geometry['coordinates']
+        else:
+            raise ValueError("Geofence geometry must be a Polygon or MultiPolygon")
+        self.id = zone_id
+        self.name = name
+        self.kind = kind
+        self.polygons = [[self.ring_edges(ring) for ring in polygon] for polygon in polygons]
+        if not self.polygons or not all(self.polygons):
+            raise ValueError("Geofence polygon has no rings")
+        outer = [polygon[0] for polygon in self.polygons]
+        self.bbox = (
+            min(float(edges[0].min()) for edges in outer),
+            min(float(edges[1].min()) for edges in outer),
+            max(float(edges[0].max()) for edges in outer),
+            max(float(edges[1].max()) for edges in outer)
+        )
+
+    @staticmethod
+    def ring_edges(ring):
+        points = np.asarray(ring, dtype=float)
+        if points.ndim != 2 or points.shape[0] < 3 or points.shape[1] < 2:
+            raise ValueError("Geofence rings need at least three [lon, lat] positions")
+        points = points[:, :2]
+        if not np.array_equal(points[0], points[-1]):
+            points = np.vstack([points, points[:1]])
+        return points[:-1, 0], points[:-1, 1], points[1:, 0], points[1:, 1]
+
+    def contains(self, lons, lats):
+        """Which of the points fall inside the zone, holes excluded"""
+        inside = np.zeros(len(lons), dtype=bool)
+        for rings in self.polygons:
+            in_polygon = ring_contains(rings[0], lons, lats)
+            for hole in rings[1:]:
+                in_polygon &= ~ring_contains(hole, lons, lats)
+            inside |= in_polygon
+        return inside
+
+class GeofenceIndex:
+    """Uniform grid over zone bounding boxes, with oversized zones checked by bounding box alone"""
+
+    def __init__(self, zones, cell_size):
+        self.zones = {zone.id: zone for zone in zones}
+        self.cell_size = cell_size
+        self.cells = {}
+        self.large = []
+        for zone in zones:
+            min_lon, min_lat, max_lon, max_lat = zone.bbox
+            xs = range(math.floor(min_lon / cell_size), math.floor(max_lon / cell_size) + 1)
+            ys = range(math.floor(min_lat / cell_size), math.floor(max_lat / cell_size) + 1)
+            if len(xs) * len(ys) > GEOFENCE_MAX_ZONE_CELLS:
+                self.large.append(zone)
+                continue
+            for cx in xs:
+                for cy in ys:
+                    self.cells.setdefault((cx, cy), []).append(zone)
+
+    def locate(self, lons, lats):
+        """The ids of the zones containing each point, as one frozenset per point"""
+        lons = np.asarray(lons, dtype=float)
+        lats = np.asarray(lats, dtype=float)
+        found = [None] * len(lons)
+        cells = {}
+        cx = np.floor(lons / self.cell_size).astype(np.int64).tolist()
+        cy = np.floor(lats / self.cell_size).astype(np.int64).tolist()
+        for i, cell in enumerate(zip(cx, cy)):
+            if cell in self.cells:
+                cells.setdefault(cell, []).append(i)
+        for cell, indexes in cells.items():
+            indexes = np.asarray(indexes)
+            for zone in self.cells[cell]:
+                for i in indexes[zone.contains(lons[indexes], lats[indexes])].tolist():
+                    found[i] = (found[i] or frozenset()) | {zone.id}
+        for zone in self.large:
+            min_lon, min_lat, max_lon, max_lat = zone.bbox
+            indexes = np.flatnonzero((lons >= min_lon) & (lons <= max_lon) & (lats >= min_lat) & (lats <= max_lat))
+            if len(indexes):
+                for i in indexes[zone.contains(lons[indexes], lats[indexes])].tolist():
+                    found[i] = (found[i] or frozenset()) | {zone.id}
+        return [zones or NO_ZONES for zones in found]
+
+NO_ZONES = frozenset()
+geofence_cache = {"index": GeofenceIndex([], GEOFENCE_GRID_DEGREES)}
+# Set when a zone is created so the reload runs without waiting out the refresh interval
+geofence_reload = threading.Event()
+
+def load_geofence_zones():
+    zones = []
+    for doc in db.geofences.find({"active": {"$ne": False}}):
+        try:
+            zones.append(GeofenceZone(str(doc['_id']), doc.get('name'), doc.get('kind', 'other'), doc['geometry']))
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Skipping invalid geofence {doc['_id']}: {str(e)}")
+    return zones
+
+def reload_geofences():
+    """Rebuild the zone index every GEOFENCE_REFRESH_SECONDS, off the ingest path"""
+    while True:
+        try:
+            with xray_recorder.in_segment('geofence_reload'):
+                # Swapped in whole, so ingest always sees a complete index
+                geofence_cache['index'] = GeofenceIndex(load_geofence_zones(), GEOFENCE_GRID_DEGREES)
+        except Exception as e:
+            logger.warning(f"Failed to load geofences: {str(e)}")
+        geofence_reload.wait(GEOFENCE_REFRESH_SECONDS)
+        geofence_reload.clear()
+
+threading.Thread(target=reload_geofences, name='geofence-reload', daemon=True).start()
+
+def current_geofence_index():
+    return geofence_cache['index']
+
+class WebhookDispatcher:
+    """Posts geofence alerts to a webhook from a background thread so ingest never waits on it"""
+
+    def __init__(self, url, max_size):
+        self.url = url
+        self.queue = queue.Queue(maxsize=max_size)
+        self.metrics = {"sent": 0, "failed": 0, "dropped": 0}
+        self.thread = threading.Thread(target=self.run, name='geofence-webhook', daemon=True)
+        self.thread.start()
+
+    def emit(self, alerts):
+        try:
+            self.queue.put_nowait(alerts)
+        except queue.Full:
+            self.metrics['dropped'] += len(alerts)
+
+    def run(self):
+        while True:
+            alerts = self.queue.get()
+            body = app.json.dumps({"alerts": alerts}).encode()
+            try:
+                with xray_recorder.in_segment('geofence_webhook'):
+                    webhook_request = urllib.request.Request(self.url, data=body, headers={'Content-Type': 'application/json'}, method='POST')
+                    with urllib.request.urlopen(webhook_request, timeout=5):  # nosec B310 - Operator-configured webhook URL
+                        pass
+                self.metrics['sent'] += len(alerts)
+            except Exception as e:
+                self.metrics['failed'] += len(alerts)
+                logger.warning(f"Geofence webhook failed: {str(e)}")
+
+class GeofenceTracker:
+    """Tracks which zones each collar is in and records entry/exit alerts on transitions.
+
+    State lives in the geofence_state collection as one small document per collar and is only
+    written when membership changes, guarded by compare-and-set so concurrent workers agree.
+    """
+
+    def __init__(self, states, alerts, webhook):
+        self.states = states
+        self.alerts = alerts
+        self.webhook = webhook
+        self.cache = {}
+        self.lock = threading.Lock()
+        self.metrics = {"fixes": 0, "alerts": 0, "conflicts": 0, "evaluations": 0, "total_eval_ms": 0.0}
+
+    def load_states(self, collars):
+        """Collar states as {collar: (zones, since)}, from the cache where it is fresh"""
+        now = time.monotonic()
+        states = {}
+        missing = []
+        with self.lock:
+            for collar in collars:
+                cached = self.cache.get(collar)
+                if cached is not None and now - cached[2] < GEOFENCE_STATE_TTL:
+                    states[collar] = cached[:2]
+                else:
+                    missing.append(collar)
+        if missing:
+            loaded = {doc['_id']: (frozenset(doc['zones']), doc['since']) for doc in self.states.find({"_id": {"$in": missing}})}
+            with self.lock:
+                for collar in missing:
+                    states[collar] = loaded.get(collar)
+                    if states[collar] is not None:
+                        self.cache[collar] = (*states[collar], now)
+        return states
+
+    def save_state(self, collar, previous, zones, since):
+        """Compare-and-set the collar's state, returning False if another worker changed it first"""
+        try:
+            if previous is None:
+                self.states.insert_one({"_id": collar, "zones": sorted(zones), "since": since})
+                saved = True
+            else:
+                result = self.states.update_one(
+                    {"_id": collar, "zones": sorted(previous[0])},
+                    {"$set": {"zones": sorted(zones), "since": since}}
+                )
+                saved = result.matched_count == 1
+        except DuplicateKeyError:
+            saved = False
+        if not saved:
+            with self.lock:
+                self.cache.pop(collar, None)
+                self.metrics['conflicts'] += 1
+            return False
+        with self.lock:
+            self.cache[collar] = (zones, since, time.monotonic())
+        return True
+
+    def transitions(self, collar, state, fixes, index):
+        """Walk one collar's fixes in time order, returning its alerts and final state"""
+        zones, since = state if state is not None else (None, None)
+        alerts = []
+        for timestamp, fix_zones, fix in fixes:
+            # Backfilled fixes older than the last transition cannot change what was already alerted
+            if since is not None and timestamp <= since:
+                continue
+            if zones is not None and fix_zones != zones:
+                for event, changed in (('exit', zones - fix_zones), ('enter', fix_zones - zones)):
+                    for zone_id in sorted(changed):
+                        zone = index.zones.get(zone_id)
+                        alerts.append({
+                            "animal_id": collar,
+                            "zone_id": zone_id,
+                            "zone_name": zone.name if zone else None,
+                            "zone_kind": zone.kind if zone else None,
+                            "event": event,
+                            "timestamp": timestamp,
+                            "latitude": fix['location']['coordinates'][1],
+                            "longitude": fix['location']['coordinates'][0],
+                            "created_at": datetime.utcnow()
+                        })
+            if zones is None or fix_zones != zones:
+                zones, since = fix_zones, timestamp
+        return alerts, (zones, since)
+
+    def process(self, fixes):
+        """Evaluate fixes against the zones, recording and emitting any entry/exit alerts"""
+        index = current_geofence_index()
+        fixes = [fix for fix in fixes if fix.get(GPS_META_FIELD) is not None and 'location' in fix]
+        if not index.zones or not fixes:
+            return []
+        start = time.perf_counter()
+        coordinates = np.array([fix['location']['coordinates'] for fix in fixes], dtype=float)
+        memberships = index.locate(coordinates[:, 0], coordinates[:, 1])
+        by_collar = {}
+        for fix, zones in zip(fixes, memberships):
+            by_collar.setdefault(fix[GPS_META_FIELD], []).append((fix['timestamp'], zones, fix))
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        alerts = []
+        states = self.load_states(list(by_collar))
+        for collar, collar_fixes in by_collar.items():
+            collar_fixes.sort(key=lambda item: item[0])
+            state = states[collar]
+            for attempt in range(2):
+                collar_alerts, new_state = self.transitions(collar, state, collar_fixes, index)
+                if new_state == state or self.save_state(collar, state, *new_state):
+                    alerts.extend(collar_alerts)
+                    break
+                # Another worker moved this collar on; re-read its state and evaluate again
+                state = self.load_states([collar])[collar]
+
+        if alerts:
+            self.alerts.insert_many(alerts)
+            for alert in alerts:
+                alert.pop('_id', None)
+                logger.info(f"Geofence {alert['event']}: {alert['animal_id']} {alert['zone_name'] or alert['zone_id']}")
+            if self.webhook is not None:
+                self.webhook.emit(alerts)
+        with self.lock:
+            self.metrics['fixes'] += len(fixes)
+            self.metrics['alerts'] += len(alerts)
+            self.metrics['evaluations'] += 1
+            self.metrics['total_eval_ms'] += elapsed_ms
+        return alerts
+
+    def snapshot(self):
+        with self.lock:
+            metrics = dict(self.metrics)
+        metrics['zones'] = len(current_geofence_index().zones)
+        metrics['avg_eval_us_per_fix'] = metrics.pop('total_eval_ms') * 1000 / metrics['fixes'] if metrics['fixes'] else 0.0
+        if self.webhook is not None:
+            metrics['webhook'] = dict(self.webhook.metrics)
+        return metrics
+
+geofence_tracker = GeofenceTracker(
+    db.geofence_state,
+    db.geofence_alerts,
+    WebhookDispatcher(GEOFENCE_WEBHOOK_URL, GEOFENCE_WEBHOOK_QUEUE) if GEOFENCE_WEBHOOK_URL else None
+)
+
+def validate_geofence(body):
+    """Validate a geofence definition, returning the document to store"""
+    if not isinstance(body, dict):
+        raise ValueError("Geofence must be an object")
+    name = body.get('name')
+    if not isinstance(name, str) or not name.strip():
+        raise ValueError("Missing name")
+    kind = body.get('kind', 'other')
+    if kind not in GEOFENCE_KINDS:
+        raise ValueError(f"kind must be one of {', '.join(sorted(GEOFENCE_KINDS))}")
+    geometry = body.get('geometry')
+    if not isinstance(geometry, dict):
+        raise ValueError("Missing geometry")
+    try:
+        zone = GeofenceZone(None, name, kind, geometry)
+    except (KeyError, TypeError) as e:
+        raise ValueError("Invalid geometry") from e
+    min_lon, min_lat, max_lon, max_lat = zone.bbox
+    if not (-180 <= min_lon and max_lon <= 180 and -90 <= min_lat and max_lat <= 90):
+        raise ValueError("Geometry coordinates out of range")
+    if max_lon - min_lon > GEOFENCE_MAX_EXTENT_DEGREES or max_lat - min_lat > GEOFENCE_MAX_EXTENT_DEGREES:
+        raise ValueError(f"Geometry is wider than {GEOFENCE_MAX_EXTENT_DEGREES:g} degrees")
+    return {"name": name.strip(), "kind": kind, "geometry": geometry, "active": True, "created_at": datetime.utcnow()}
+
+@app.route('/wildlife/api/geofences', methods=['GET'])
+def get_geofences():
+    try:
+        logger.info("Getting geofences")
+        zones = []
+        for doc in db.geofences.find({"active": {"$ne": False}}):
+            doc['id'] = str(doc.pop('_id'))
+            zones.append(doc)
+        return jsonify(zones), 200
+    except Exception as e:
+        logger.error(f"Error getting geofences: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/wildlife/api/geofences', methods=['POST'])
+def create_geofence():
+    try:
+        logger.info("Creating geofence")
+        try:
+            zone = validate_geofence(request.get_json(silent=True))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        result = db.geofences.insert_one(zone)
+        # This worker picks the zone up now; others within GEOFENCE_REFRESH_SECONDS
+        geofence_reload.set()
+        return jsonify({"message": "Geofence created", "id": str(result.inserted_id)}), 201
+    except Exception as e:
+        logger.error(f"Error creating geofence: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/wildlife/api/geofences/alerts', methods=['GET'])
+def get_geofence_alerts():
+    try:
+        logger.info("Getting geofence alerts")
+        query = {}
+        if request.args.get('animal_id'):
+            query['animal_id'] = request.args['animal_id']
+        try:
+            limit = min(int(request.args.get('limit', '100')), GPS_MAX_LIMIT)
+        except ValueError:
+            return jsonify({"error": "Invalid limit"}), 400
+        if limit < 1:
+            return jsonify({"error": "Invalid limit"}), 400
+        cursor = db.geofence_alerts.find(query, {'_id': False}).sort('created_at', DESCENDING).limit(limit)
+        return stream_documents(cursor)
+    except Exception as e:
+        logger.error(f"Error getting geofence alerts: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+## Collar state: last known position and movement of each collar, kept current on ingest
+
+# Dirty collars are written to collar_state in one bulk write per interval
+COLLAR_STATE_FLUSH_INTERVAL = float(os.getenv('COLLAR_STATE_FLUSH_INTERVAL', '1.0'))
+# Other workers ingest fixes for the same collars, so cached positions are re-read after this long
+COLLAR_STATE_TTL = float(os.getenv('COLLAR_STATE_TTL', '10'))
+
+def distance_and_bearing(lat1, lon1, lat2, lon2):
+    """Great-circle distance in meters and initial bearing in degrees between two positions"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    delta_lambda = math.radians(lon2 - lon1)
+    a = math.sin((phi2 - phi1) / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda / 2) ** 2
+    distance = 2 * EARTH_RADIUS_METERS * math.asin(min(1.0, math.sqrt(a)))
+    bearing = math.degrees(math.atan2(
+        math.sin(delta_lambda) * math.cos(phi2),
+        math.cos(phi1) * math.sin(phi2) - math.sin(phi1) * math.cos(phi2) * math.cos(delta_lambda)
+    )) % 360
+    return distance, bearing
+
+class CollarState:
+    """Latest fix of one collar, plus counters not yet written to collar_state"""
+    __slots__ = ('latitude', 'longitude', 'timestamp', 'speed', 'heading', 'loaded_at',
+                 'moved', 'pending_fixes', 'pending_first', 'pending_seen')
+
+    def __init__(self, doc=None):
+        doc = doc or {}
+        self.latitude = doc.get('latitude')
+        self.longitude = doc.get('longitude')
+        self.timestamp = doc.get('timestamp')
+        self.speed = doc.get('speed_mps')
+        self.heading = doc.get('heading')
+        self.loaded_at = time.monotonic()
+        self.moved = False
+        self.pending_fixes = 0
+        self.pending_first = None
+        self.pending_seen = None
+
+    def advance(self, fix):
+        lon, lat = fix['location']['coordinates']
+        timestamp = fix['timestamp']
+        received_at = fix.get('received_at', timestamp)
+        self.pending_fixes += 1
+        self.pending_first = timestamp if self.pending_first is None else min(self.pending_first, timestamp)
+        self.pending_seen = received_at if self.pending_seen is None else max(self.pending_seen, received_at)
+        # Backfilled fixes count towards the fix rate but never move the collar backwards
+        if self.timestamp is not None and timestamp <= self.timestamp:
+            return
+        if self.timestamp is not None:
+            distance, bearing = distance_and_bearing(self.latitude, self.longitude, lat, lon)
+            self.speed = distance / (timestamp - self.timestamp).total_seconds()
+            if distance > 0:
+                # A collar standing still keeps the heading it last moved on
+                self.heading = bearing
+        self.latitude, self.longitude, self.timestamp = lat, lon, timestamp
+        self.moved = True
+
+    def flush_operations(self, collar):
+        """Bulk write operations for the pending changes"""
+        operations = [UpdateOne({"_id": collar}, {
+            "$inc": {"fixes": self.pending_fixes},
+            "$min": {"first_seen": self.pending_first},
+            "$max": {"last_seen": self.pending_seen}
+        }, upsert=True)]
+        if self.moved:
+            # Only move the stored position forwards; another worker may already hold a newer fix
+            operations.append(UpdateOne(
+                {"_id": collar, "$or": [{"timestamp": {"$lt": self.timestamp}}, {"timestamp": {"$exists": False}}]},
+                {"$set": {
+                    "latitude": self.latitude,
+                    "longitude": self.longitude,
+                    "timestamp": self.timestamp,
+                    "speed_mps": self.speed,
+                    "heading": self.heading
+                }},
+                upsert=True
+            ))
+        return operations
+
+    def take_pending(self):
+        """Reset the pending changes, returning them so a failed write can put them back"""
+        pending = (self.moved, self.pending_fixes, self.pending_first, self.pending_seen)
+        self.moved = False
+        self.pending_fixes = 0
+        self.pending_first = None
+        self.pending_seen = None
+        return pending
+
+    def restore(self, pending):
+        """Merge changes from a failed write back in with any that arrived since"""
+        moved, fixes, first, seen = pending
+        # The position itself is never reset, so it is already as new as anything being restored
+        self.moved = self.moved or moved
+        self.pending_fixes += fixes
+        if first is not None:
+            self.pending_first = first if self.pending_first is None else min(self.pending_first, first)
+        if seen is not None:
+            self.pending_seen = seen if self.pending_seen is None else max(self.pending_seen, seen)
+
+class CollarStateTable:
+    """In-memory collar states, updated per fix and flushed to MongoDB by a background thread.
+
+    Fix counts and first/last seen merge with $inc/$min/$max, so every worker's share of a collar's
+    fixes adds up. Speed and heading come from the previous fix this worker knew about.
+    """
+
+    def __init__(self, collection, flush_interval):
+        self.collection = collection
+        self.flush_interval = flush_interval
+        self.states = {}
+        self.dirty = set()
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.metrics = {"collars": 0, "fixes": 0, "flushes": 0, "flushed": 0, "stale_writes": 0, "failed_flushes": 0}
+        self.thread = threading.Thread(target=self.run, name='collar-state-flusher', daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def refresh(self, collars):
+        """Re-read collars that are not cached, or whose cached state may be behind other workers"""
+        now = time.monotonic()
+        with self.lock:
+            stale = [collar for collar in collars if collar not in self.dirty
+                     and (collar not in self.states or now - self.states[collar].loaded_at > COLLAR_STATE_TTL)]
+        if not stale:
+            return
+        docs = {doc['_id']: doc for doc in self.collection.find({"_id": {"$in": stale}})}
+        with self.lock:
+            for collar in stale:
+                if collar in self.dirty:
+                    # Updated by another request while this one was reading
+                    continue
+                state = self.states.get(collar)
+                doc = docs.get(collar)
+                if doc is not None and doc.get('timestamp') is None:
+                    # Counters without a position yet, e.g. from a partial write; the next flush sets one
+                    logger.warning(f"Ignoring collar state without a timestamp: {collar}")
+                    doc = None
+                if state is None or (doc is not None and (state.timestamp is None or doc['timestamp'] > state.timestamp)):
+                    state = CollarState(doc)
+                state.loaded_at = now
+                self.states[collar] = state
+            self.metrics['collars'] = len(self.states)
+
+    def update(self, fixes):
+        by_collar = {}
+        for fix in fixes:
+            if fix.get(GPS_META_FIELD) is not None and 'location' in fix:
+                by_collar.setdefault(fix[GPS_META_FIELD], []).append(fix)
+        if not by_collar:
+            return
+        self.refresh(list(by_collar))
+        with self.lock:
+            for collar, collar_fixes in by_collar.items():
+                state = self.states.setdefault(collar, CollarState())
+                for fix in sorted(collar_fixes, key=lambda fix: fix['timestamp']):
+                    state.advance(fix)
+                self.dirty.add(collar)
+            self.metrics['fixes'] += sum(len(collar_fixes) for collar_fixes in by_collar.values())
+
+    def run(self):
+        while not self.stopping.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        operations, pending = [], {}
+        with self.lock:
+            collars, self.dirty = self.dirty, set()
+            for collar in collars:
+                state = self.states[collar]
+                operations.extend(state.flush_operations(collar))
+                pending[collar] = state.take_pending()
+        if not operations:
+            return
+        try:
+            with xray_recorder.in_segment('collar_state_flush'):
+                self.collection.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            # A duplicate key here is a position upsert that lost to a newer fix from another worker
+            write_errors = e.details.get('writeErrors', [])
+            stale = sum(1 for error in write_errors if error.get('code') == 11000)
+            with self.lock:
+                self.metrics['stale_writes'] += stale
+            if stale < len(write_errors):
+                logger.error(f"Collar state flush rejected {len(write_errors) - stale} writes")
+        except Exception as e:
+            # Keep the changes for the next flush; refresh leaves dirty collars alone meanwhile
+            with self.lock:
+                for collar, changes in pending.items():
+                    self.states.setdefault(collar, CollarState()).restore(changes)
+                self.dirty.update(pending)
+                self.metrics['failed_flushes'] += 1
+            logger.warning(f"Collar state flush failed, retrying {len(pending)} collars next flush: {str(e)}")
+            return
+        with self.lock:
+            self.metrics['flushes'] += 1
+            self.metrics['flushed'] += len(collars)
+
+    def stop(self):
+        self.stopping.set()
+        self.thread.join(self.flush_interval + 5)
+        self.flush()
+
+    def snapshot(self):
+        with self.lock:
+            metrics = dict(self.metrics)
+            metrics['dirty'] = len(self.dirty)
+        return metrics
+
+def seed_collar_state():
+    """Fill an empty collar_state from the last 24 hours of fixes, so existing collars show up at once"""
+    try:
+        if db.collar_state.estimated_document_count() > 0:
+            return
+        logger.info("Seeding collar_state from recent GPS fixes")
+        db.gps_tracking.aggregate([
+            {"$match": {
+                "timestamp": {"$gt": datetime.utcnow() - timedelta(hours=24)},
+                GPS_META_FIELD: {"$ne": None},
+                "location": {"$exists": True}
+            }},
+            {"$sort": {GPS_META_FIELD: 1, "timestamp": 1}},
+            {"$group": {
+                "_id": f"${GPS_META_FIELD}",
+                "latitude": {"$last": {"$arrayElemAt": ["$location.coordinates", 1]}},
+                "longitude": {"$last": {"$arrayElemAt": ["$location.coordinates", 0]}},
+                "timestamp": {"$last": "$timestamp"},
+                "fixes": {"$sum": 1},
+                "first_seen": {"$first": "$timestamp"},
+                "last_seen": {"$max": {"$ifNull": ["$received_at", "$timestamp"]}}
+            }},
+            # Collars that reported while the seed ran are already current
+            {"$merge": {"into": "collar_state", "whenMatched": "keepExisting", "whenNotMatched": "insert"}}
+        ])
+    except Exception as e:
+        logger.warning(f"Failed to seed collar_state: {str(e)}")
+
+seed_collar_state()
+collar_states = CollarStateTable(db.collar_state, COLLAR_STATE_FLUSH_INTERVAL)
+collar_states.start()
+atexit.register(collar_states.stop)
+
+def track_gps_fixes(fixes):
+    """Update collar state and geofences for stored fixes; failures are logged and never fail the ingest"""
+    for name, handler in (('Collar state update', collar_states.update), ('Geofence evaluation', geofence_tracker.process)):
+        try:
+            handler(fixes)
+        except Exception as e:
+            logger.error(f"{name} failed: {str(e)}")
+
+def format_collar_state(doc):
+    collar = {
+        "animal_id": doc['_id'],
+        "latitude": doc.get('latitude'),
+        "longitude": doc.get('longitude'),
+        "timestamp": doc.get('timestamp'),
+        "last_seen": doc.get('last_seen'),
+        "speed_mps": doc.get('speed_mps'),
+        "heading": doc.get('heading'),
+        "fixes": doc.get('fixes', 0),
+        "fix_rate_per_hour": None
+    }
+    if collar['fixes'] > 1 and doc.get('first_seen') and collar['timestamp'] and collar['timestamp'] > doc['first_seen']:
+        hours = (collar['timestamp'] - doc['first_seen']).total_seconds() / 3600
+        collar['fix_rate_per_hour'] = round((collar['fixes'] - 1) / hours, 2)
+    return collar
+
+@app.route('/wildlife/api/gps/latest', methods=['GET'])
+def get_gps_latest():
+    try:
+        logger.info("Getting latest GPS positions")
+        query = {"timestamp": {"$exists": True}}
+        if request.args.get('animal_id'):
+            query['_id'] = {"$in": request.args['animal_id'].split(',')}
+        if request.args.get('max_age'):
+            try:
+                max_age = float(request.args['max_age'])
+            except ValueError:
+                return jsonify({"error": "Invalid max_age"}), 400
+            query['last_seen'] = {"$gte": datetime.utcnow() - timedelta(seconds=max_age)}
+        collars = [format_collar_state(doc) for doc in db.collar_state.find(query).sort('_id', ASCENDING)]
+        return jsonify(collars), 200
+    except Exception as e:
+        logger.error(f"Error getting latest GPS positions: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+# Write-behind settings
+GPS_WRITE_BEHIND = os.getenv('GPS_WRITE_BEHIND', 'false').lower() == 'true'
+GPS_QUEUE_MAX_SIZE = int(os.getenv('GPS_QUEUE_MAX_SIZE', '10000'))
+GPS_FLUSH_BATCH_SIZE = int(os.getenv('GPS_FLUSH_BATCH_SIZE', '500'))
+GPS_FLUSH_INTERVAL = float(os.getenv('GPS_FLUSH_INTERVAL', '1.0'))
+GPS_FLUSH_ATTEMPTS = int(os.getenv('GPS_FLUSH_ATTEMPTS', '3'))
+# Must stay below the ECS stopTimeout (30 seconds by default)
+GPS_DRAIN_TIMEOUT = float(os.getenv('GPS_DRAIN_TIMEOUT', '25'))
+
+class GPSWriteBehindBuffer:
+    """Bounded queue of GPS fixes flushed to MongoDB in batches by a background thread"""
+
+    def __init__(self, collection, max_size, batch_size, flush_interval):
+        self.collection = collection
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=max_size)
+        self.stopping = threading.Event()
+        self.lock = threading.Lock()
+        self.metrics = {
+            "flushes": 0,
+            "flushed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "last_flush_ms": 0.0,
+            "max_flush_ms": 0.0,
+            "total_flush_ms": 0.0
+        }
+        self.thread = threading.Thread(target=self.run, name='gps-flusher', daemon=True)
+
+    def start(self):
+        logger.info("Starting GPS write-behind flusher")
+        self.thread.start()
+
+    def enqueue(self, fix):
+        """Queue a fix for writing, returning False when the buffer cannot accept it"""
+        if not self.stopping.is_set():
+            try:
+                self.queue.put_nowait(fix)
+                return True
+            except queue.Full:
+                pass
+        with self.lock:
+            self.metrics['rejected'] += 1
+        return False
+
+    def run(self):
+        while not (self.stopping.is_set() and self.queue.empty()):
+            batch = self.collect()
+            if batch:
+                self.flush(batch)
+
+    def collect(self):
+        """Gather fixes until the batch is full or the flush window closes"""
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            try:
+                if self.stopping.is_set():
+                    # Draining: take what is queued without waiting for more
+                    batch.append(self.queue.get_nowait())
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def flush(self, batch):
+        start = time.monotonic()
+        inserted = 0
+        stored = []
+        for attempt in range(GPS_FLUSH_ATTEMPTS):
+            try:
+                with xray_recorder.in_segment('gps_write_behind_flush'):
+                    self.collection.insert_many(batch, ordered=False)
+                inserted = len(batch)
+                stored = batch
+                break
+            except BulkWriteError as e:
+                inserted = e.details.get('nInserted', 0)
+                rejected = {error['index'] for error in e.details.get('writeErrors', [])}
+                stored = [fix for i, fix in enumerate(batch) if i not in rejected]
+                logger.error(f"GPS flush rejected {len(batch) - inserted} of {len(batch)} fixes")
+                break
+            except Exception as e:
+                logger.warning(f"GPS flush failed (attempt {attempt+1}/{GPS_FLUSH_ATTEMPTS}): {str(e)}")
+                if attempt < GPS_FLUSH_ATTEMPTS - 1:
+                    time.sleep(1)
+        elapsed_ms = (time.monotonic() - start) * 1000
+        if stored:
+            with xray_recorder.in_segment('gps_write_behind_track'):
+                track_gps_fixes(stored)
+        with self.lock:
+            self.metrics['flushes'] += 1
+            self.metrics['flushed'] += inserted
+            self.metrics['failed'] += len(batch) - inserted
+            self.metrics['last_flush_ms'] = elapsed_ms
+            self.metrics['max_flush_ms'] = max(self.metrics['max_flush_ms'], elapsed_ms)
+            self.metrics['total_flush_ms'] += elapsed_ms
+
+    def drain(self, timeout):
+        """Stop accepting fixes and wait for everything queued to be written"""
+        if self.stopping.is_set():
+            return
+        logger.info(f"Draining GPS write-behind buffer ({self.queue.qsize()} fixes queued)")
+        self.stopping.set()
+        self.thread.join(timeout)
+        if self.thread.is_alive():
+            logger.warning(f"GPS drain timed out with {self.queue.qsize()} fixes still queued")
+        else:
+            logger.info("GPS write-behind buffer drained")
+
+    def snapshot(self):
+        with self.lock:
+            metrics = dict(self.metrics)
+        metrics['queue_depth'] = self.queue.qsize()
+        metrics['queue_capacity'] = self.queue.maxsize
+        metrics['avg_flush_ms'] = metrics.pop('total_flush_ms') / metrics['flushes'] if metrics['flushes'] else 0.0
+        return metrics
+
+gps_buffer = None
+if GPS_WRITE_BEHIND:
+    gps_buffer = GPSWriteBehindBuffer(db.gps_tracking, GPS_QUEUE_MAX_SIZE, GPS_FLUSH_BATCH_SIZE, GPS_FLUSH_INTERVAL)
+    gps_buffer.start()
+    # Gunicorn workers exit normally after a graceful stop, so this also drains in production
+    atexit.register(gps_buffer.drain, GPS_DRAIN_TIMEOUT)
+
+def handle_sigterm(signum, frame):
+    # ECS sends SIGTERM on task stop; the development server has no graceful shutdown of its own,
+    # so exit here and let the atexit hooks flush queued fixes
+    logger.info("SIGTERM received")
+    raise SystemExit(0)
+
+@app.route('/wildlife/api/gps/metrics', methods=['GET'])
+def get_gps_metrics():
+    metrics = {"write_behind": GPS_WRITE_BEHIND}
+    if gps_buffer is not None:
+        metrics.update(gps_buffer.snapshot())
+    metrics['stream'] = gps_broadcaster.snapshot()
+    metrics['geofences'] = geofence_tracker.snapshot()
+    metrics['collar_state'] = collar_states.snapshot()
+    return jsonify(metrics), 200
+
 @app.route('/wildlife/api/gps', methods=['POST'])
 def receive_gps():
     try:
         logger.info("Receiving GPS data")
         data = request.json
         data['timestamp'] = datetime.utcnow()
+        data['received_at'] = data['timestamp']
+        add_gps_location(data)
+        if gps_buffer is not None:
+            # Collar state and geofences are updated by the flusher once the fix is stored
+            if gps_buffer.enqueue(data):
+                return jsonify({"message": "GPS data accepted"}), 202
+            logger.warning("GPS write-behind queue full, rejecting fix")
+            return jsonify({"error": "GPS ingest queue is full"}), 503, {'Retry-After': '1'}
         db.gps_tracking.insert_one(data)
+        track_gps_fixes([data])
         return jsonify({"message": "GPS data received"}), 200
     except Exception as e:
         logger.error(f"Error receiving GPS data: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+# Delta sync settings. Bulk uploads carry old collar timestamps, so the watermark is the time a fix
+# reached the service. Fixes newer than the settle window (which covers write-behind flushes) are held back.
+DELTA_SETTLE_SECONDS = float(os.getenv('DELTA_SETTLE_SECONDS', '5'))
+
+def encode_watermark(doc):
+    """Encode the (received_at, _id) of the last fix returned as an opaque watermark"""
+    payload = {"r": doc['received_at'].isoformat(), "id": str(doc['_id'])}
+    return urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+def decode_watermark(since):
+    """Decode a watermark (or a plain ISO timestamp) into a query matching later fixes"""
+    if not since:
+        # A fresh sync starts from the same 24 hour window as the full GPS read
+        return {"received_at": {"$gt": datetime.utcnow() - timedelta(hours=24)}}
+    try:
+        return {"received_at": {"$gt": parse_timestamp(since)}}
+    except ValueError:
+        pass
+    try:
+        padded = since + '=' * (-len(since) % 4)
+        payload = json.loads(urlsafe_b64decode(padded.encode()))
+        last_id = ObjectId(payload['id'])
+        received_at = datetime.fromisoformat(payload['r'])
+    except (ValueError, KeyError, TypeError, InvalidId) as e:
+        raise ValueError("Invalid since watermark") from e
+    return {"$or": [
+        {"received_at": {"$gt": received_at}},
+        {"received_at": received_at, "_id": {"$gt": last_id}}
+    ]}
+
+def get_gps_changes(geo_query):
+    """Return fixes received after the since watermark, oldest first, with the next watermark"""
+    try:
+        limit = min(int(request.args.get('limit', GPS_MAX_LIMIT)), GPS_MAX_LIMIT)
+    except ValueError:
+        return jsonify({"error": "Invalid limit"}), 400
+    if limit < 1:
+        return jsonify({"error": "Invalid limit"}), 400
+    since = request.args.get('since', '')
+    try:
+        since_query = decode_watermark(since)
+    except ValueError:
+        logger.warning(f"Invalid since watermark: {since}")
+        return jsonify({"error": "Invalid since watermark"}), 400
+
+    settled = {"received_at": {"$lte": datetime.utcnow() - timedelta(seconds=DELTA_SETTLE_SECONDS)}}
+    query = {"$and": [clause for clause in (geo_query, since_query, settled) if clause]}
+    docs = list(db.gps_tracking.find(query)
+                .sort([('received_at', ASCENDING), ('_id', ASCENDING)])
+                .limit(limit + 1))
+    has_more = len(docs) > limit
+    docs = docs[:limit]
+    # With nothing new the client keeps its watermark
+    next_since = encode_watermark(docs[-1]) if docs else since
+    for doc in docs:
+        doc.pop('_id')
+    return jsonify({"items": docs, "next_since": next_since, "has_more": has_more}), 200
+
 @app.route('/wildlife/api/gps', methods=['GET'])
 def get_gps_data():
     try:
         logger.info("Getting GPS data")
         cutoff = datetime.utcnow() - timedelta(hours=24)
-        gps_data = list(db.gps_tracking.find(
-            {"timestamp": {"$gt": cutoff}}, 
+        try:
+            geo_query = parse_geo_query()
+            limit = int(request.args['limit']) if 'limit' in request.args else None
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        if 'since' in request.args:
+            return get_gps_changes(geo_query)
+        cursor = db.gps_tracking.find(
+            {"timestamp": {"$gt": cutoff}, **geo_query}, 
             {'_id': False}
-        ))
-        return jsonify(gps_data), 200
+        )
+        if limit is not None:
+            if limit < 1:
+                return jsonify({"error": "Invalid limit"}), 400
+            # Limited requests return the newest fixes first
+            cursor = cursor.sort('timestamp', DESCENDING).limit(min(limit, GPS_MAX_LIMIT))
+        return stream_documents(cursor)
     except Exception as e:
         logger.error(f"Error getting GPS data: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+## Trajectories: per-collar GPS history, downsampled for drawing and movement analysis
+
+TRAJECTORY_DEFAULT_TOLERANCE = float(os.getenv('TRAJECTORY_DEFAULT_TOLERANCE', '25'))
+# Raw fixes loaded for one Douglas-Peucker request; longer windows should use time buckets
+TRAJECTORY_MAX_POINTS = int(os.getenv('TRAJECTORY_MAX_POINTS', '200000'))
+TRAJECTORY_MAX_COLLARS = int(os.getenv('TRAJECTORY_MAX_COLLARS', '100'))
+
+def parse_trajectory_window():
+    """Read the start/end window (default: the last 24 hours) and optional collar filter"""
+    end = parse_timestamp(request.args['end']) if request.args.get('end') else datetime.utcnow()
+    start = parse_timestamp(request.args['start']) if request.args.get('start') else end - timedelta(hours=24)
+    if start >= end:
+        raise ValueError("start must be before end")
+    query = {"timestamp": {"$gte": start, "$lt": end}}
+    if request.args.get('animal_id'):
+        collars = [collar for collar in request.args['animal_id'].split(',') if collar]
+        if len(collars) > TRAJECTORY_MAX_COLLARS:
+            raise ValueError(f"Too many collars (max {TRAJECTORY_MAX_COLLARS})")
+        query[GPS_META_FIELD] = {"$in": collars}
+    return start, end, query
+
+def douglas_peucker(x, y, tolerance):
+    """Mask of the points Douglas-Peucker keeps, with each split's distances computed in one vector op"""
+    keep = np.zeros(len(x), dtype=bool)
+    if len(x) == 0:
+        return keep
+    keep[0] = keep[-1] = True
+    stack = [(0, len(x) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        dx, dy = x[last] - x[first], y[last] - y[first]
+        px, py = x[first + 1:last] - x[first], y[first + 1:last] - y[first]
+        length = math.hypot(dx, dy)
+        # A track that returns to its start is measured by distance from that point
+        distances = np.abs(dx * py - dy * px) / length if length else np.hypot(px, py)
+        index = int(np.argmax(distances))
+        if distances[index] > tolerance:
+            split = first + 1 + index
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    return keep
+
+def simplify_track(latitudes, longitudes, tolerance):
+    """Simplify one collar's track with a tolerance in meters, returning the kept indexes"""
+    # Local equirectangular projection is accurate to well under a meter across a reserve
+    scale = math.cos(math.radians(float(np.mean(latitudes))))
+    x = np.radians(longitudes) * scale * EARTH_RADIUS_METERS
+    y = np.radians(latitudes) * EARTH_RADIUS_METERS
+    return np.flatnonzero(douglas_peucker(x, y, tolerance))
+
+def simplify_tracks(tracks, tolerance):
+    """Kept indexes for every collar's track, as {collar: indexes}"""
+    return {collar: simplify_track(latitudes, longitudes, tolerance)
+            for collar, (_, latitudes, longitudes) in tracks.items()}
+
+def run_cpu_bound(function, *args):
+    """Run CPU-bound work on a native thread under gevent workers, so the hub keeps serving other requests"""
+    if monkey.is_module_patched('threading'):
+        return get_hub().threadpool.apply(function, args)
+    return function(*args)
+
+def encode_polyline(latitudes, longitudes, precision=5):
+    """Encode coordinates in the encoded polyline format used by Google Maps and OSRM"""
+    values = np.round(np.column_stack([latitudes, longitudes]) * 10 ** precision).astype(np.int64)
+    deltas = np.diff(values, axis=0, prepend=np.zeros((1, 2), dtype=np.int64)).ravel()
+    deltas = np.where(deltas < 0, ~(deltas << 1), deltas << 1)
+    chars = []
+    for value in deltas.tolist():
+        while value >= 0x20:
+            chars.append(chr((0x20 | (value & 0x1f)) + 63))
+            value >>= 5
+        chars.append(chr(value + 63))
+    return ''.join(chars)
+
+def format_track(collar, timestamps, latitudes, longitudes, raw_points):
+    track = {
+        "animal_id": collar,
+        "raw_points": raw_points,
+        "points": len(latitudes),
+        "start": timestamps[0].isoformat(),
+        "end": timestamps[-1].isoformat()
+    }
+    if request.args.get('format') == 'polyline':
+        track['polyline'] = encode_polyline(latitudes, longitudes)
+    else:
+        track['coordinates'] = np.column_stack([longitudes, latitudes]).round(6).tolist()
+    if request.args.get('timestamps', 'false').lower() == 'true':
+        track['timestamps'] = [timestamp.isoformat() for timestamp in timestamps]
+    return track
+
+def load_tracks(query):
+    """Group the window's fixes by collar in time order, as NumPy arrays"""
+    # The single-fix endpoint stores whatever it is sent; only fixes with a validated location have a position
+    query = {"$and": [query, {"location": {"$exists": True}}]}
+    projection = {'_id': False, GPS_META_FIELD: True, 'timestamp': True, 'location': True}
+    cursor = db.gps_tracking.find(query, projection).sort([(GPS_META_FIELD, ASCENDING), ('timestamp', ASCENDING)])
+    tracks = {}
+    loaded = 0
+    for fix in cursor.batch_size(STREAM_BATCH_SIZE * 10):
+        loaded += 1
+        if loaded > TRAJECTORY_MAX_POINTS:
+            raise ValueError(f"Window has more than {TRAJECTORY_MAX_POINTS} fixes, use method=bucket or a shorter window")
+        try:
+            longitude, latitude = (float(value) for value in fix['location']['coordinates'][:2])
+            timestamp = fix['timestamp']
+        except (KeyError, TypeError, ValueError):
+            continue
+        track = tracks.setdefault(fix.get(GPS_META_FIELD), ([], [], []))
+        track[0].append(timestamp)
+        track[1].append(latitude)
+        track[2].append(longitude)
+    return {collar: (timestamps, np.asarray(latitudes, dtype=float), np.asarray(longitudes, dtype=float))
+            for collar, (timestamps, latitudes, longitudes) in tracks.items()}
+
+def bucket_tracks(query, bucket_seconds):
+    """Average each collar's fixes into fixed time buckets inside MongoDB, shipping one point per bucket"""
+    pipeline = [
+        {"$match": {"$and": [query, {"location": {"$exists": True}}]}},
+        {"$group": {
+            "_id": {
+                "collar": f"${GPS_META_FIELD}",
+                "bucket": {"$dateTrunc": {"date": "$timestamp", "unit": "second", "binSize": bucket_seconds}}
+            },
+            "latitude": {"$avg": {"$arrayElemAt": ["$location.coordinates", 1]}},
+            "longitude": {"$avg": {"$arrayElemAt": ["$location.coordinates", 0]}},
+            "fixes": {"$sum": 1}
+        }},
+        {"$sort": {"_id.collar": 1, "_id.bucket": 1}}
+    ]
+    tracks = {}
+    raw_points = {}
+    for row in db.gps_tracking.aggregate(pipeline, allowDiskUse=True):
+        collar = row['_id']['collar']
+        track = tracks.setdefault(collar, ([], [], []))
+        track[0].append(row['_id']['bucket'])
+        track[1].append(row['latitude'])
+        track[2].append(row['longitude'])
+        raw_points[collar] = raw_points.get(collar, 0) + row['fixes']
+    return {collar: (timestamps, np.asarray(latitudes, dtype=float), np.asarray(longitudes, dtype=float), raw_points[collar])
+            for collar, (timestamps, latitudes, longitudes) in tracks.items()}
+
+@app.route('/wildlife/api/gps/trajectories', methods=['GET'])
+def get_trajectories():
+    try:
+        logger.info("Getting GPS trajectories")
+        method = request.args.get('method', 'dp')
+        try:
+            start, end, query = parse_trajectory_window()
+            tolerance = float(request.args.get('tolerance', TRAJECTORY_DEFAULT_TOLERANCE))
+            bucket_seconds = int(request.args.get('bucket', '300'))
+            if method not in ('dp', 'bucket', 'raw') or tolerance < 0 or bucket_seconds < 1:
+                raise ValueError("Invalid method, tolerance or bucket")
+            collars = []
+            if method == 'bucket':
+                for collar, (timestamps, latitudes, longitudes, raw_points) in bucket_tracks(query, bucket_seconds).items():
+                    collars.append(format_track(collar, timestamps, latitudes, longitudes, raw_points))
+            else:
+                tracks = load_tracks(query)
+                simplified = run_cpu_bound(simplify_tracks, tracks, tolerance) if method == 'dp' else {}
+                for collar, (timestamps, latitudes, longitudes) in tracks.items():
+                    kept = simplified[collar] if method == 'dp' else np.arange(len(latitudes))
+                    collars.append(format_track(collar, [timestamps[i] for i in kept], latitudes[kept], longitudes[kept], len(latitudes)))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        result = {"start": start.isoformat(), "end": end.isoformat(), "method": method, "collars": collars}
+        if method == 'dp':
+            result['tolerance_m'] = tolerance
+        elif method == 'bucket':
+            result['bucket_seconds'] = bucket_seconds
+        return jsonify(result), 200
+    except Exception as e:
+        logger.error(f"Error getting GPS trajectories: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+## Real-time GPS push (Server-Sent Events)
+
+# One feed per process reads new fixes, either from a change stream or, where change streams are
+# unavailable (standalone mongod, time-series collections), by polling past a received_at watermark.
+# The server stamps received_at, so collar clocks and backfilled bulk uploads cannot move it.
+# The feed fans each batch out to every connected client, so load follows new data, not client count.
+GPS_STREAM_POLL_INTERVAL = float(os.getenv('GPS_STREAM_POLL_INTERVAL', '1'))
+# Write-behind flushes land a little after received_at, so polls re-scan this many seconds
+GPS_STREAM_LAG = float(os.getenv('GPS_STREAM_LAG', '10'))
+GPS_STREAM_KEEPALIVE = float(os.getenv('GPS_STREAM_KEEPALIVE', '15'))
+GPS_STREAM_CLIENT_QUEUE = int(os.getenv('GPS_STREAM_CLIENT_QUEUE', '100'))
+GPS_STREAM_MAX_CLIENTS = int(os.getenv('GPS_STREAM_MAX_CLIENTS', '500'))
+
+class GPSStreamSubscriber:
+    """Queue of fix batches for one connected client"""
+
+    def __init__(self, max_batches):
+        self.queue = queue.Queue(maxsize=max_batches)
+        self.overflowed = False
+
+class GPSBroadcaster:
+    """Feeds new GPS fixes from MongoDB to every subscribed push client in this process"""
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.subscribers = set()
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.thread = None
+        self.mode = None
+        self.metrics = {"published": 0, "batches": 0, "dropped_clients": 0}
+
+    def subscribe(self):
+        """Register a client, returning None when the process is at its client limit"""
+        subscriber = GPSStreamSubscriber(GPS_STREAM_CLIENT_QUEUE)
+        with self.lock:
+            if len(self.subscribers) >= GPS_STREAM_MAX_CLIENTS:
+                return None
+            self.subscribers.add(subscriber)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name='gps-stream-feed', daemon=True)
+                self.thread.start()
+        self.wakeup.set()
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self.lock:
+            self.subscribers.discard(subscriber)
+
+    def publish(self, fixes):
+        with self.lock:
+            subscribers = list(self.subscribers)
+            self.metrics['published'] += len(fixes)
+            self.metrics['batches'] += 1
+        for subscriber in subscribers:
+            try:
+                subscriber.queue.put_nowait(fixes)
+            except queue.Full:
+                # A client this far behind is disconnected; it reconnects and catches up from its cursor
+                subscriber.overflowed = True
+                self.unsubscribe(subscriber)
+                with self.lock:
+                    self.metrics['dropped_clients'] += 1
+
+    def run(self):
+        if 'timeseries' not in self.collection.options():
+            try:
+                self.watch()
+                return
+            except OperationFailure as e:
+                logger.info(f"GPS change stream unavailable, polling for new fixes: {str(e)}")
+            except Exception as e:
+                logger.warning(f"GPS change stream stopped, polling for new fixes: {str(e)}")
+        self.poll()
+
+    def watch(self):
+        with self.collection.watch([{"$match": {"operationType": "insert"}}]) as stream:
+            self.mode = 'change_stream'
+            logger.info("Watching GPS change stream for push clients")
+            for change in stream:
+                self.publish([change['fullDocument']])
+
+    def poll(self):
+        self.mode = 'poll'
+        watermark = datetime.utcnow()
+        seen = {}
+        while True:
+            # Sleep while nobody is listening rather than polling for no one
+            with self.lock:
+                idle = not self.subscribers
+            if idle:
+                self.wakeup.clear()
+                self.wakeup.wait()
+                watermark = max(watermark, datetime.utcnow() - timedelta(seconds=GPS_STREAM_LAG))
+            try:
+                with xray_recorder.in_segment('gps_stream_poll'):
+                    fixes = list(self.collection.find(
+                        {"received_at": {"$gt": watermark - timedelta(seconds=GPS_STREAM_LAG)}}
+                    ).sort([('received_at', ASCENDING), ('_id', ASCENDING)]).limit(GPS_MAX_LIMIT))
+            except Exception as e:
+                logger.warning(f"GPS stream poll failed: {str(e)}")
+                fixes = []
+            fresh = [fix for fix in fixes if fix['_id'] not in seen]
+            for fix in fresh:
+                seen[fix['_id']] = fix['received_at']
+                watermark = max(watermark, fix['received_at'])
+            # Forget fixes that have fallen out of the re-scan window
+            cutoff = watermark - timedelta(seconds=GPS_STREAM_LAG)
+            seen = {fix_id: timestamp for fix_id, timestamp in seen.items() if timestamp > cutoff}
+            if fresh:
+                self.publish(fresh)
+            time.sleep(GPS_STREAM_POLL_INTERVAL)
+
+    def snapshot(self):
+        with self.lock:
+            return {"mode": self.mode, "clients": len(self.subscribers), **self.metrics}
+
+gps_broadcaster = GPSBroadcaster(db.gps_tracking)
+
+def format_gps_event(fixes):
+    """Encode a batch of fixes as one SSE message; its id is the delta sync watermark to resume after"""
+    data = app.json.dumps([{key: value for key, value in fix.items() if key != '_id'} for fix in fixes])
+    cursor = encode_watermark(max(fixes, key=lambda fix: (fix['received_at'], fix['_id'])))
+    return f"id: {cursor}\nevent: gps\ndata: {data}\n\n"
+
+def generate_gps_events(subscriber, backlog):
+    try:
+        # Tell EventSource to wait a little before reconnecting after a dropped stream
+        yield "retry: 3000\n\n"
+        sent = set()
+        # The catch-up query and the live feed overlap for about one poll window after connecting
+        dedupe_until = time.monotonic() + GPS_STREAM_LAG + GPS_STREAM_POLL_INTERVAL
+        for start in range(0, len(backlog), STREAM_BATCH_SIZE):
+            batch = backlog[start:start + STREAM_BATCH_SIZE]
+            sent.update(fix['_id'] for fix in batch)
+            yield format_gps_event(batch)
+        while not subscriber.overflowed:
+            try:
+                fixes = subscriber.queue.get(timeout=GPS_STREAM_KEEPALIVE)
+            except queue.Empty:
+                # Comment lines keep idle connections open through the ALB
+                yield ": keepalive\n\n"
+                continue
+            if sent:
+                fixes = [fix for fix in fixes if fix['_id'] not in sent]
+                if time.monotonic() > dedupe_until:
+                    sent = set()
+            if fixes:
+                yield format_gps_event(fixes)
+    finally:
+        gps_broadcaster.unsubscribe(subscriber)
+
+@app.route('/wildlife/api/gps/stream', methods=['GET'])
+def stream_gps():
+    try:
+        logger.info("Opening GPS push stream")
+        # EventSource resends the last event id on reconnect, which supersedes the original since
+        since = request.headers.get('Last-Event-ID') or request.args.get('since')
+        try:
+            since_query = decode_watermark(since) if since else None
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        subscriber = gps_broadcaster.subscribe()
+        if subscriber is None:
+            return jsonify({"error": "Too many GPS stream clients"}), 429, {'Retry-After': '5'}
+        backlog = []
+        try:
+            if since_query is not None:
+                # Catch up on fixes missed while disconnected, bounded to the last 24 hours
+                recent = {"received_at": {"$gt": datetime.utcnow() - timedelta(hours=24)}}
+                backlog = list(db.gps_tracking.find({"$and": [since_query, recent]})
+                               .sort([('received_at', ASCENDING), ('_id', ASCENDING)])
+                               .limit(GPS_MAX_LIMIT))
+        except Exception:
+            gps_broadcaster.unsubscribe(subscriber)
+            raise
+        return Response(
+            stream_with_context(generate_gps_events(subscriber, backlog)),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+    except Exception as e:
+        logger.error(f"Error opening GPS stream: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+def collect_plan_details(node, stages, indexes):
+    """Walk an explain document collecting stage and index names"""
+    if isinstance(node, dict):
+        if 'stage' in node:
+            stages.append(node['stage'])
+        if 'indexName' in node:
+            indexes.add(node['indexName'])
+        for value in node.values():
+            collect_plan_details(value, stages, indexes)
+    elif isinstance(node, list):
+        for value in node:
+            collect_plan_details(value, stages, indexes)
+
+def find_execution_stats(node):
+    """Find executionStats anywhere in an explain document (time-series plans nest it)"""
+    if isinstance(node, dict):
+        if 'executionStats' in node:
+            return node['executionStats']
+        values = node.values()
+    elif isinstance(node, list):
+        values = node
+    else:
+        return None
+    for value in values:
+        stats = find_execution_stats(value)
+        if stats is not None:
+            return stats
+    return None
+
+@app.route('/wildlife/api/gps/explain', methods=['GET'])
+def explain_gps_query():
+    try:
+        logger.info("Explaining GPS query plan")
+        cutoff = datetime.utcnow() - timedelta(hours=24)
+        explain = db.gps_tracking.find({"timestamp": {"$gt": cutoff}}, {'_id': False}).explain()
+        stages = []
+        indexes = set()
+        # Time-series plans have no top-level queryPlanner, so walk the whole document
+        collect_plan_details(explain.get('queryPlanner', {}).get('winningPlan', explain), stages, indexes)
+        stats = find_execution_stats(explain) or {}
+        return jsonify({
+            "timeseries": 'timeseries' in db.gps_tracking.options(),
+            "stages": stages,
+            "indexes": sorted(indexes),
+            "collection_scan": 'COLLSCAN' in stages,
+            "n_returned": stats.get('nReturned'),
+            "total_keys_examined": stats.get('totalKeysExamined'),
+            "total_docs_examined": stats.get('totalDocsExamined'),
+            "execution_time_ms": stats.get('executionTimeMillis')
+        }), 200
+    except Exception as e:
+        logger.error(f"Error explaining GPS query: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
 if __name__ == '__main__':
     logger.info("Starting alerts service")
+    signal.signal(signal.SIGTERM, handle_sigterm)
     app.run(host='0.0.0.0', port=5000)  # nosec B104, nosemgrep: avoid_app_run_with_bad_host - Required for containerized deployment: 0.0.0.0 binding allows ECS Service Connect and ALB to reach container
\ No newline at end of file
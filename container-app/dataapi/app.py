@@ -1,8 +1,24 @@
 # Data API Service - faciliates frontend access to data service
 
-from flask import Flask, jsonify, request
-from pymongo import MongoClient
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+from bson import ObjectId
+from bson.errors import InvalidId
+import click
+from werkzeug.http import is_resource_modified
+from flask import Flask, Response, jsonify, request, stream_with_context
+from pymongo import ASCENDING, DESCENDING, GEOSPHERE, MongoClient, ReturnDocument
+from pymongo.errors import DuplicateKeyError, OperationFailure
 import logging
+import random
 import time
 from aws_xray_sdk.core import xray_recorder, patch_all
 from aws_xray_sdk.ext.flask.middleware import XRayMiddleware
@@ -25,32 +41,694 @@ logger.info("initializing xray middleware")
 # Add X-Ray middleware to Flask
 XRayMiddleware(app, xray_recorder)
 
-# Simple retry mechanism: 60 attempts with 30-second delay (30 minutes total)
-def connect_with_retry(connect_func, service_name, max_attempts=60, delay=30):
+# Startup retry policy: exponential backoff with jitter until the deadline (30 minutes by default).
+# Only used while the service starts; request handlers never sleep on retries.
+STARTUP_RETRY_DEADLINE = float(os.getenv('STARTUP_RETRY_DEADLINE', '1800'))
+STARTUP_RETRY_MAX_DELAY = float(os.getenv('STARTUP_RETRY_MAX_DELAY', '30'))
+
+def connect_with_retry(connect_func, service_name, deadline=STARTUP_RETRY_DEADLINE, base_delay=1, max_delay=STARTUP_RETRY_MAX_DELAY):
     logger.info(f"Connecting to {service_name} with retry logic...")
-    
-    for attempt in range(max_attempts):
+    give_up_at = time.monotonic() + deadline
+    attempt = 0
+    while True:
+        attempt += 1
         try:
             result = connect_func()
-            logger.info(f"Successfully connected to {service_name} on attempt {attempt+1}")
+            logger.info(f"Successfully connected to {service_name} on attempt {attempt}")
             return result
         except Exception as e:
-            if attempt < max_attempts - 1:
-                logger.warning(f"Connection to {service_name} failed (attempt {attempt+1}/{max_attempts}): {str(e)}")
-                logger.info(f"Retrying in {delay} seconds...")
-                time.sleep(delay)
-            else:
-                logger.warning(f"Failed to connect to {service_name} after {max_attempts} attempts (30 minutes)")
+            backoff = min(max_delay, base_delay * 2 ** (attempt - 1))
+            delay = backoff / 2 + random.uniform(0, backoff / 2)
+            if time.monotonic() + delay > give_up_at:
+                logger.warning(f"Failed to connect to {service_name} after {attempt} attempts ({deadline:.0f} second deadline)")
                 raise
+            logger.warning(f"Connection to {service_name} failed (attempt {attempt}): {str(e)}")
+            logger.info(f"Retrying in {delay:.1f} seconds...")
+            time.sleep(delay)
+
+MONGO_URI = os.getenv('MONGO_URI', 'mongodb://wildlife-datadb.wildlife:27017')
+
+def connect_mongo():
+    """Create the MongoDB client and check the server is reachable (MongoClient itself connects lazily)"""
+    client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=5000)
+    try:
+        client.admin.command('ping')
+    except Exception:
+        client.close()
+        raise
+    return client
 
 # Initialize MongoDB client
 logger.info("Starting MongoDB")
 client = connect_with_retry(
-    lambda: MongoClient('mongodb://wildlife-datadb.wildlife:27017'),
+    connect_mongo,
     'MongoDB (wildlife-datadb)'
 )
 db = client.wildlife_db
 
+# Pagination settings
+DEFAULT_PAGE_SIZE = int(os.getenv('SIGHTINGS_DEFAULT_PAGE_SIZE', '100'))
+MAX_PAGE_SIZE = int(os.getenv('SIGHTINGS_MAX_PAGE_SIZE', '1000'))
+FIELD_NAME_PATTERN = re.compile(r'^[A-Za-z0-9_]+$')
+
+# Geospatial query settings
+EARTH_RADIUS_METERS = 6378100
+DEFAULT_NEAR_RADIUS_METERS = float(os.getenv('DEFAULT_NEAR_RADIUS_METERS', '1000'))
+
+def parse_geo_query():
+    """Build a geospatial filter from the bbox or near/radius query parameters"""
+    if request.args.get('bbox'):
+        try:
+            min_lon, min_lat, max_lon, max_lat = [float(value) for value in request.args['bbox'].split(',')]
+        except ValueError:
+            raise ValueError("Invalid bbox")
+        if not (-180 <= min_lon < max_lon <= 180 and -90 <= min_lat < max_lat <= 90):
+            raise ValueError("Invalid bbox")
+        ring = [[min_lon, min_lat], [max_lon, min_lat], [max_lon, max_lat], [min_lon, max_lat], [min_lon, min_lat]]
+        return {"location": {"$geoWithin": {"$geometry": {"type": "Polygon", "coordinates": [ring]}}}}
+
+    if request.args.get('near'):
+        try:
+            lon, lat = [float(value) for value in request.args['near'].split(',')]
+            radius = float(request.args.get('radius', DEFAULT_NEAR_RADIUS_METERS))
+        except ValueError:
+            raise ValueError("Invalid near or radius")
+        if not (-180 <= lon <= 180 and -90 <= lat <= 90 and radius > 0):
+            raise ValueError("Invalid near or radius")
+        # $centerSphere takes its radius in radians
+        return {"location": {"$geoWithin": {"$centerSphere": [[lon, lat], radius / EARTH_RADIUS_METERS]}}}
+
+    return {}
+
+# Streaming settings
+STREAM_BATCH_SIZE = int(os.getenv('STREAM_BATCH_SIZE', '500'))
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+def generate_json_array(cursor):
+    """Yield a JSON array one cursor batch at a time"""
+    yield '['
+    separator = ''
+    batch = []
+    for doc in cursor:
+        batch.append(app.json.dumps(doc))
+        if len(batch) >= STREAM_BATCH_SIZE:
+            yield separator + ','.join(batch)
+            separator = ','
+            batch = []
+    if batch:
+        yield separator + ','.join(batch)
+    yield ']'
+
+def generate_ndjson(cursor):
+    """Yield newline-delimited JSON one cursor batch at a time"""
+    batch = []
+    for doc in cursor:
+        batch.append(app.json.dumps(doc))
+        if len(batch) >= STREAM_BATCH_SIZE:
+            yield '\n'.join(batch) + '\n'
+            batch = []
+    if batch:
+        yield '\n'.join(batch) + '\n'
+
+def start_cursor(cursor):
+    """Fetch the first batch now, so a failing query raises before the 200 and its headers are sent"""
+    first = next(cursor, None)
+
+    def documents():
+        if first is not None:
+            yield first
+            yield from cursor
+    return documents()
+
+def stream_documents(cursor):
+    """Stream a MongoDB cursor as a JSON array, or as NDJSON when the client asks for it"""
+    cursor = start_cursor(cursor.batch_size(STREAM_BATCH_SIZE))
+    if request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE:
+        return Response(stream_with_context(generate_ndjson(cursor)), mimetype=NDJSON_MIMETYPE)
+    return Response(stream_with_context(generate_json_array(cursor)), mimetype='application/json')
+
+def ensure_indexes():
+    """Create the indexes backing the sightings queries"""
+    try:
+        logger.info("Ensuring sightings indexes")
+        # Keyset pagination walks sightings newest first on (timestamp, _id)
+        db.sightings.create_index(
+            [('timestamp', DESCENDING), ('_id', DESCENDING)],
+            name='timestamp_id_desc'
+        )
+        db.sightings.create_index([('location', GEOSPHERE)])
+        # Delta sync walks changes oldest first on (updated_at, _id)
+        db.sightings.create_index(
+            [('updated_at', ASCENDING), ('_id', ASCENDING)],
+            name='updated_at_id'
+        )
+        # The media service expires sightings whose image upload never completed
+        db.sightings.create_index(
+            [('image_status', ASCENDING), ('updated_at', ASCENDING)],
+            name='pending_image_updated_at',
+            partialFilterExpression={'image_status': 'pending'}
+        )
+        # The media service checks no sighting shows an upload before deleting it
+        db.sightings.create_index([('image_url', ASCENDING)], name='image_url', sparse=True)
+        # The media service sweeps issued upload keys once they expire
+        db.uploads.create_index([('expires_at', ASCENDING)])
+        # Statistics read rollups by day, optionally filtered by species
+        db.sightings_rollups.create_index([('day', ASCENDING), ('species', ASCENDING)])
+        # Sightings written before updated_at was tracked count as changed when they were reported
+        stamped = db.sightings.update_many(
+            {"updated_at": {"$exists": False}, "timestamp": {"$type": "date"}},
+            [{"$set": {"updated_at": "$timestamp"}}]
+        )
+        if stamped.modified_count:
+            logger.info(f"Backfilled updated_at on {stamped.modified_count} sightings")
+        # Sightings written before GeoJSON points were stored get one derived from latitude/longitude
+        backfill = db.sightings.update_many(
+            {
+                "location": {"$exists": False},
+                "latitude": {"$type": "number", "$gte": -90, "$lte": 90},
+                "longitude": {"$type": "number", "$gte": -180, "$lte": 180}
+            },
+            [{"$set": {"location": {"type": "Point", "coordinates": ["$longitude", "$latitude"]}}}]
+        )
+        if backfill.modified_count:
+            logger.info(f"Backfilled location on {backfill.modified_count} sightings")
+        # Sightings written before ids were assigned at write time take the string form of their _id,
+        # which is what the media service returned as sighting_id
+        assigned = db.sightings.update_many({"id": {"$exists": False}}, [{"$set": {"id": {"$toString": "$_id"}}}])
+        if assigned.modified_count:
+            logger.info(f"Backfilled id on {assigned.modified_count} sightings")
+        # Sparse so sightings from a media task still on the old image can be inserted during a rollout
+        db.sightings.create_index([('id', ASCENDING)], name='id_unique', unique=True, sparse=True)
+    except Exception as e:
+        logger.warning(f"Failed to ensure sightings indexes: {str(e)}")
+
+ensure_indexes()
+
+def encode_cursor(doc):
+    """Encode the sort key of the last document on a page as an opaque cursor"""
+    timestamp = doc.get('timestamp')
+    payload = {
+        "t": timestamp.isoformat() if isinstance(timestamp, datetime) else None,
+        "id": str(doc['_id'])
+    }
+    return urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    """Decode an opaque cursor into a query matching documents after it"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(urlsafe_b64decode(padded.encode()))
+        last_id = ObjectId(payload['id'])
+        timestamp = datetime.fromisoformat(payload['t']) if payload.get('t') else None
+    except (ValueError, KeyError, TypeError, InvalidId) as e:
+        raise ValueError("Invalid cursor") from e
+
+    if timestamp is None:
+        # Documents without a timestamp sort last, so only the _id tie-breaker remains
+        return {"timestamp": None, "_id": {"$lt": last_id}}
+    return {"$or": [
+        {"timestamp": {"$lt": timestamp}},
+        {"timestamp": timestamp, "_id": {"$lt": last_id}},
+        {"timestamp": None}
+    ]}
+
+# Delta sync settings. Changes newer than the settle window are held back so writes still in flight,
+# or stamped by a task whose clock runs slightly behind, are not skipped by the next watermark.
+DELTA_SETTLE_SECONDS = float(os.getenv('DELTA_SETTLE_SECONDS', '2'))
+
+def encode_watermark(doc):
+    """Encode the (updated_at, _id) of the last change returned as an opaque watermark"""
+    payload = {"u": doc['updated_at'].isoformat(), "id": str(doc['_id'])}
+    return urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+def decode_watermark(since):
+    """Decode a watermark (or a plain ISO timestamp) into a query matching later changes"""
+    if not since:
+        return {"updated_at": {"$type": "date"}}
+    try:
+        updated_at = datetime.fromisoformat(since.replace('Z', '+00:00'))
+        if updated_at.tzinfo is not None:
+            updated_at = updated_at.astimezone(timezone.utc).replace(tzinfo=None)
+        return {"updated_at": {"$gt": updated_at}}
+    except ValueError:
+        pass
+    try:
+        padded = since + '=' * (-len(since) % 4)
+        payload = json.loads(urlsafe_b64decode(padded.encode()))
+        last_id = ObjectId(payload['id'])
+        updated_at = datetime.fromisoformat(payload['u'])
+    except (ValueError, KeyError, TypeError, InvalidId) as e:
+        raise ValueError("Invalid since watermark") from e
+    return {"$or": [
+        {"updated_at": {"$gt": updated_at}},
+        {"updated_at": updated_at, "_id": {"$gt": last_id}}
+    ]}
+
+def sighting_id_query(ids):
+    """Match sightings by id, or by _id for any written without one that startup has not backfilled yet"""
+    object_ids = [ObjectId(sighting_id) for sighting_id in ids if ObjectId.is_valid(sighting_id)]
+    if not object_ids:
+        return {"id": {"$in": ids}}
+    return {"$or": [{"id": {"$in": ids}}, {"_id": {"$in": object_ids}}]}
+
+def parse_fields(fields):
+    """Parse a comma-separated field list into a MongoDB projection"""
+    names = [name.strip() for name in fields.split(',') if name.strip()]
+    if not names or not all(FIELD_NAME_PATTERN.match(name) for name in names):
+        raise ValueError("Invalid fields parameter")
+    return names
+
+# Rollup settings: sightings counted per UTC day, species and grid cell, kept current from sightings
+# changes so statistics never scan the sightings themselves
+ROLLUP_CELL_DEGREES = float(os.getenv('ROLLUP_CELL_DEGREES', '0.1'))
+ROLLUP_INTERVAL = float(os.getenv('ROLLUP_INTERVAL', '30'))
+# One worker updates the rollups at a time; a lease left by a stopped worker expires after this long
+ROLLUP_LEASE_SECONDS = float(os.getenv('ROLLUP_LEASE_SECONDS', '300'))
+ROLLUP_GROUP_FIELDS = ('day', 'species', 'cell')
+ROLLUP_OWNER = f"{os.uname().nodename}-{os.getpid()}"
+
+# Set by the sightings change stream so rollups follow writes without waiting a full interval
+rollup_wakeup = threading.Event()
+
+def rollup_day(day):
+    """Recompute the rollups of one UTC day from its sightings and merge them in place"""
+    now = datetime.utcnow()
+    # MongoDB keeps milliseconds, so truncate to compare computed_at exactly below
+    computed_at = now.replace(microsecond=now.microsecond // 1000 * 1000)
+
+    def cell(coordinate):
+        return {"$cond": [
+            {"$ifNull": ["$location", False]},
+            {"$floor": {"$divide": [{"$arrayElemAt": ["$location.coordinates", coordinate]}, ROLLUP_CELL_DEGREES]}},
+            None
+        ]}
+
+    db.sightings.aggregate([
+        {"$match": {"timestamp": {"$gte": day, "$lt": day + timedelta(days=1)}}},
+        {"$group": {
+            "_id": {"day": day, "species": {"$ifNull": ["$species", "Unknown"]}, "cell_x": cell(0), "cell_y": cell(1)},
+            "sightings": {"$sum": 1},
+            # count arrives as form text; a sighting without a usable count is one animal
+            "animals": {"$sum": {"$convert": {"input": "$count", "to": "int", "onError": 1, "onNull": 1}}}
+        }},
+        {"$project": {
+            "day": "$_id.day",
+            "species": "$_id.species",
+            "cell_x": "$_id.cell_x",
+            "cell_y": "$_id.cell_y",
+            "sightings": True,
+            "animals": True,
+            "computed_at": {"$literal": computed_at}
+        }},
+        {"$merge": {"into": "sightings_rollups", "on": "_id", "whenMatched": "replace", "whenNotMatched": "insert"}}
+    ])
+    # Buckets the day no longer has were not rewritten by the merge
+    db.sightings_rollups.delete_many({"day": day, "computed_at": {"$lt": computed_at}})
+
+def rollup_days(query):
+    """Return the UTC days holding the sightings matched by the query"""
+    query = {"$and": [query, {"timestamp": {"$type": "date"}}]}
+    return sorted(row['_id'] for row in db.sightings.aggregate([
+        {"$match": query},
+        {"$group": {"_id": {"$dateTrunc": {"date": "$timestamp", "unit": "day"}}}}
+    ]))
+
+def rebuild_rollups(start=None, end=None):
+    """Recompute the rollups of every day from start up to (not including) end, returning the day count"""
+    day_range = {}
+    if start:
+        day_range['$gte'] = start
+    if end:
+        day_range['$lt'] = end
+    days = rollup_days({"timestamp": day_range} if day_range else {})
+    stale = {"day": {"$nin": days}}
+    if day_range:
+        stale = {"$and": [stale, {"day": day_range}]}
+    db.sightings_rollups.delete_many(stale)
+    for day in days:
+        rollup_day(day)
+    return len(days)
+
+def update_rollups():
+    """Refresh the rollup days touched since the last run, if this worker holds the rollup lease"""
+    now = datetime.utcnow()
+    try:
+        state = db.rollup_state.find_one_and_update(
+            {"_id": "sightings", "$or": [{"lease_until": {"$lt": now}}, {"owner": ROLLUP_OWNER}]},
+            {"$set": {"owner": ROLLUP_OWNER, "lease_until": now + timedelta(seconds=ROLLUP_LEASE_SECONDS)}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
+        # Another worker holds the lease
+        return
+    # Same settle window as delta sync, so writes stamped slightly in the past are not skipped
+    settled_until = now - timedelta(seconds=DELTA_SETTLE_SECONDS)
+    if state.get('watermark') is None:
+        logger.info("No rollup watermark, rebuilding sightings rollups")
+        count = rebuild_rollups()
+    else:
+        days = rollup_days({"updated_at": {"$gt": state['watermark'], "$lte": settled_until}})
+        for day in days:
+            rollup_day(day)
+        count = len(days)
+    db.rollup_state.update_one(
+        {"_id": "sightings", "owner": ROLLUP_OWNER},
+        {"$set": {"watermark": settled_until, "lease_until": now}}
+    )
+    if count:
+        logger.info(f"Updated sightings rollups for {count} days")
+
+def run_rollups():
+    while True:
+        try:
+            with xray_recorder.in_segment('sightings_rollup'):
+                update_rollups()
+        except Exception as e:
+            logger.warning(f"Sightings rollup failed: {str(e)}")
+        if rollup_wakeup.wait(ROLLUP_INTERVAL):
+            rollup_wakeup.clear()
+            # Let the change pass the settle window before it is picked up
+            time.sleep(DELTA_SETTLE_SECONDS)
+
+threading.Thread(target=run_rollups, name='sightings-rollup', daemon=True).start()
+
+def cell_bounds(cell_x, cell_y):
+    """Return [min_lon, min_lat, max_lon, max_lat] of a rollup grid cell"""
+    if cell_x is None or cell_y is None:
+        return None
+    return [round(value * ROLLUP_CELL_DEGREES, 6) for value in (cell_x, cell_y, cell_x + 1, cell_y + 1)]
+
+# Data version and response cache settings
+DATA_VERSION_TTL = float(os.getenv('DATA_VERSION_TTL', '2'))
+RESPONSE_CACHE_TTL = float(os.getenv('RESPONSE_CACHE_TTL', '60'))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv('RESPONSE_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+RESPONSE_CACHE_MAX_ENTRY_BYTES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRY_BYTES', str(8 * 1024 * 1024)))
+
+data_version = {"version": None, "checked_at": 0.0, "watching": False}
+data_version_lock = threading.Lock()
+response_cache = OrderedDict()
+response_cache_bytes = 0
+response_cache_lock = threading.Lock()
+
+def refresh_data_version():
+    """Recompute the sightings version from the collection count, newest sighting and latest change"""
+    latest = db.sightings.find_one({}, {'timestamp': True}, sort=[('timestamp', DESCENDING), ('_id', DESCENDING)])
+    # Updates such as an image finishing processing move updated_at without adding a sighting
+    changed = db.sightings.find_one({}, {'updated_at': True}, sort=[('updated_at', DESCENDING), ('_id', DESCENDING)])
+    changed_at = changed.get('updated_at') if changed else None
+    version = f"{db.sightings.estimated_document_count()}-{latest['_id'] if latest else ''}-{changed_at.isoformat() if changed_at else ''}"
+    with data_version_lock:
+        data_version['version'] = version
+        data_version['checked_at'] = time.monotonic()
+
+def watch_sightings():
+    """Refresh the data version on every sightings change, when change streams are available"""
+    try:
+        with db.sightings.watch() as stream:
+            with data_version_lock:
+                data_version['watching'] = True
+            logger.info("Watching sightings change stream for data version updates")
+            for _ in stream:
+                refresh_data_version()
+                rollup_wakeup.set()
+    except OperationFailure as e:
+        # Standalone mongod has no change streams; the version is polled instead
+        logger.info(f"Sightings change stream unavailable, polling data version: {str(e)}")
+    except Exception as e:
+        logger.warning(f"Sightings change stream stopped, polling data version: {str(e)}")
+    with data_version_lock:
+        data_version['watching'] = False
+
+threading.Thread(target=watch_sightings, name='sightings-watcher', daemon=True).start()
+
+def current_data_version():
+    """Return the data version, only querying MongoDB when the polled value is stale"""
+    with data_version_lock:
+        fresh = data_version['version'] is not None and (
+            data_version['watching'] or time.monotonic() - data_version['checked_at'] < DATA_VERSION_TTL)
+        if fresh:
+            return data_version['version']
+    refresh_data_version()
+    with data_version_lock:
+        return data_version['version']
+
+def get_cached_response(etag):
+    with response_cache_lock:
+        entry = response_cache.get(etag)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[2] > RESPONSE_CACHE_TTL:
+            evict_cached_response(etag)
+            return None
+        response_cache.move_to_end(etag)
+        return entry
+
+def evict_cached_response(etag):
+    global response_cache_bytes
+    body, _, _ = response_cache.pop(etag)
+    response_cache_bytes -= len(body)
+
+def store_cached_response(etag, body, mimetype):
+    global response_cache_bytes
+    if len(body) > RESPONSE_CACHE_MAX_ENTRY_BYTES:
+        return
+    with response_cache_lock:
+        if etag in response_cache:
+            evict_cached_response(etag)
+        response_cache[etag] = (body, mimetype, time.monotonic())
+        response_cache_bytes += len(body)
+        while response_cache_bytes > RESPONSE_CACHE_MAX_BYTES:
+            evict_cached_response(next(iter(response_cache)))
+
+def cache_streamed_body(chunks, etag, mimetype):
+    """Pass streamed chunks through while keeping a copy for the cache if the body stays small"""
+    body = []
+    size = 0
+    for chunk in chunks:
+        if body is not None:
+            body.append(chunk)
+            size += len(chunk)
+            if size > RESPONSE_CACHE_MAX_ENTRY_BYTES:
+                body = None
+        yield chunk
+    if body is not None:
+        store_cached_response(etag, ''.join(body).encode(), mimetype)
+
+def versioned_response(view):
+    """Serve an ETag, answer conditional GETs and cache bodies per data version"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        # Delta requests hold back the settle window, so their result changes with time as well as data
+        if 'since' in request.args:
+            return view(*args, **kwargs)
+        version = current_data_version()
+        # The same data can be rendered differently per URL and Accept header
+        etag = hashlib.sha1(f"{version}|{request.full_path}|{request.accept_mimetypes}".encode()).hexdigest()
+
+        # No Last-Modified: a deletion lowers nothing, so If-Modified-Since would revalidate a stale copy.
+        # The version (and so the ETag) includes the document count, which a deletion does change.
+        if not is_resource_modified(request.environ, etag=etag):
+            response = Response(status=304)
+        else:
+            cached = get_cached_response(etag)
+            if cached is not None:
+                response = Response(cached[0], mimetype=cached[1])
+            else:
+                response = app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                if response.is_streamed:
+                    response.response = cache_streamed_body(response.response, etag, response.mimetype)
+                else:
+                    store_cached_response(etag, response.get_data(), response.mimetype)
+
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        response.vary.add('Accept')
+        return response
+    return wrapper
+
+# Cluster settings
+CLUSTER_CELLS_PER_TILE = int(os.getenv('CLUSTER_CELLS_PER_TILE', '8'))
+CLUSTER_MAX_TILES = int(os.getenv('CLUSTER_MAX_TILES', '64'))
+CLUSTER_CACHE_SIZE = int(os.getenv('CLUSTER_CACHE_SIZE', '4096'))
+MAX_ZOOM = 22
+
+cluster_cache = OrderedDict()
+cluster_cache_lock = threading.Lock()
+
+def tile_bounds(zoom, x, y):
+    """Return (min_lon, min_lat, max_lon, max_lat) of an XYZ web mercator tile"""
+    n = 2 ** zoom
+    min_lon = x / n * 360 - 180
+    max_lon = (x + 1) / n * 360 - 180
+    max_lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / n))))
+    min_lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * (y + 1) / n))))
+    return min_lon, min_lat, max_lon, max_lat
+
+def tile_ranges(zoom, min_lon, min_lat, max_lon, max_lat):
+    """Return the x and y index ranges of the XYZ tiles covering a bounding box"""
+    n = 2 ** zoom
+
+    def tile_x(lon):
+        return min(n - 1, max(0, int((lon + 180) / 360 * n)))
+
+    def tile_y(lat):
+        lat = max(-85.0511, min(85.0511, lat))
+        return min(n - 1, max(0, int((1 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2 * n)))
+
+    return range(tile_x(min_lon), tile_x(max_lon) + 1), range(tile_y(max_lat), tile_y(min_lat) + 1)
+
+def compute_tile_clusters(zoom, x, y):
+    """Bin the sightings of one tile into a grid and summarize each cell"""
+    min_lon, min_lat, max_lon, max_lat = tile_bounds(zoom, x, y)
+    cell_width = (max_lon - min_lon) / CLUSTER_CELLS_PER_TILE
+    cell_height = (max_lat - min_lat) / CLUSTER_CELLS_PER_TILE
+
+    if zoom >= 2:
+        ring = [[min_lon, min_lat], [max_lon, min_lat], [max_lon, max_lat], [min_lon, max_lat], [min_lon, min_lat]]
+        match = {"location": {"$geoWithin": {"$geometry": {"type": "Polygon", "coordinates": [ring]}}}}
+    else:
+        # Tiles this large exceed a hemisphere, which $geometry polygons cannot express
+        match = {
+            "location": {"$exists": True},
+            "longitude": {"$gte": min_lon, "$lt": max_lon},
+            "latitude": {"$gte": min_lat, "$lt": max_lat}
+        }
+
+    lon = {"$arrayElemAt": ["$location.coordinates", 0]}
+    lat = {"$arrayElemAt": ["$location.coordinates", 1]}
+    pipeline = [
+        {"$match": match},
+        {"$project": {
+            "_id": False,
+            "lon": lon,
+            "lat": lat,
+            "species": {"$toString": {"$ifNull": ["$species", "unknown"]}}
+        }},
+        {"$group": {
+            "_id": {
+                "cx": {"$floor": {"$divide": [{"$subtract": ["$lon", min_lon]}, cell_width]}},
+                "cy": {"$floor": {"$divide": [{"$subtract": ["$lat", min_lat]}, cell_height]}},
+                "species": "$species"
+            },
+            "count": {"$sum": 1},
+            "sum_lon": {"$sum": "$lon"},
+            "sum_lat": {"$sum": "$lat"}
+        }},
+        {"$group": {
+            "_id": {"cx": "$_id.cx", "cy": "$_id.cy"},
+            "count": {"$sum": "$count"},
+            "sum_lon": {"$sum": "$sum_lon"},
+            "sum_lat": {"$sum": "$sum_lat"},
+            "species": {"$push": {"k": "$_id.species", "v": "$count"}}
+        }},
+        {"$project": {
+            "_id": False,
+            "count": True,
+            "longitude": {"$divide": ["$sum_lon", "$count"]},
+            "latitude": {"$divide": ["$sum_lat", "$count"]},
+            "species": {"$arrayToObject": "$species"}
+        }}
+    ]
+    return list(db.sightings.aggregate(pipeline))
+
+def get_tile_clusters(zoom, x, y, data_version):
+    """Return cached clusters for a tile, computing them on a miss"""
+    key = (zoom, x, y, data_version)
+    with cluster_cache_lock:
+        if key in cluster_cache:
+            cluster_cache.move_to_end(key)
+            return cluster_cache[key]
+
+    clusters = compute_tile_clusters(zoom, x, y)
+
+    with cluster_cache_lock:
+        cluster_cache[key] = clusters
+        while len(cluster_cache) > CLUSTER_CACHE_SIZE:
+            cluster_cache.popitem(last=False)
+    return clusters
+
+def get_sightings_page(base_query):
+    """Return one page of sightings, newest first, with a cursor for the next page"""
+    try:
+        limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return jsonify({"error": "Invalid limit"}), 400
+    if limit < 1:
+        return jsonify({"error": "Invalid limit"}), 400
+    limit = min(limit, MAX_PAGE_SIZE)
+
+    query = base_query
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            cursor_query = decode_cursor(cursor)
+        except ValueError:
+            logger.warning(f"Invalid cursor: {cursor}")
+            return jsonify({"error": "Invalid cursor"}), 400
+        query = {"$and": [base_query, cursor_query]} if base_query else cursor_query
+
+    projection = None
+    requested_fields = None
+    if request.args.get('fields'):
+        try:
+            requested_fields = parse_fields(request.args['fields'])
+        except ValueError:
+            return jsonify({"error": "Invalid fields parameter"}), 400
+        # The sort key is always fetched so the next cursor can be built
+        projection = {name: True for name in requested_fields}
+        projection['timestamp'] = True
+
+    # Fetch one extra document to learn whether another page exists
+    docs = list(db.sightings.find(query, projection)
+                .sort([('timestamp', DESCENDING), ('_id', DESCENDING)])
+                .limit(limit + 1))
+    has_more = len(docs) > limit
+    docs = docs[:limit]
+    next_cursor = encode_cursor(docs[-1]) if has_more else None
+
+    for doc in docs:
+        doc.pop('_id', None)
+        if requested_fields is not None and 'timestamp' not in requested_fields:
+            doc.pop('timestamp', None)
+
+    return jsonify({"items": docs, "next_cursor": next_cursor}), 200
+
+def get_sightings_changes(base_query):
+    """Return sightings changed after the since watermark, oldest first, with the next watermark"""
+    try:
+        limit = min(int(request.args.get('limit', MAX_PAGE_SIZE)), MAX_PAGE_SIZE)
+    except ValueError:
+        return jsonify({"error": "Invalid limit"}), 400
+    if limit < 1:
+        return jsonify({"error": "Invalid limit"}), 400
+    since = request.args.get('since', '')
+    try:
+        since_query = decode_watermark(since)
+    except ValueError:
+        logger.warning(f"Invalid since watermark: {since}")
+        return jsonify({"error": "Invalid since watermark"}), 400
+
+    settled = {"updated_at": {"$lte": datetime.utcnow() - timedelta(seconds=DELTA_SETTLE_SECONDS)}}
+    query = {"$and": [clause for clause in (base_query, since_query, settled) if clause]}
+    docs = list(db.sightings.find(query)
+                .sort([('updated_at', ASCENDING), ('_id', ASCENDING)])
+                .hint('updated_at_id')
+                .limit(limit + 1))
+    has_more = len(docs) > limit
+    docs = docs[:limit]
+    # With nothing new the client keeps its watermark
+    next_since = encode_watermark(docs[-1]) if docs else since
+
+    for doc in docs:
+        # Changed sightings are keyed by id so the client can upsert them into its copy
+        doc.setdefault('id', str(doc['_id']))
+        doc.pop('_id')
+
+    return jsonify({"items": docs, "next_since": next_since, "has_more": has_more}), 200
+
 @app.route('/wildlife/health')
 def health_check():
     logger.info("Health check requested")
@@ -60,21 +738,189 @@ def health_check():
     }), 200
 
 @app.route('/wildlife/api/sightings', methods=['GET'])
+@versioned_response
 def get_sightings():
     try:
         logger.info("Getting sightings from MongoDB")
-        sightings = list(db.sightings.find({}, {'_id': False}))
-        return jsonify(sightings), 200
+        try:
+            geo_query = parse_geo_query()
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        if 'since' in request.args:
+            return get_sightings_changes(geo_query)
+        if any(arg in request.args for arg in ('limit', 'cursor', 'fields')):
+            return get_sightings_page(geo_query)
+        # Unpaginated requests are kept for compatibility and streamed
+        return stream_documents(db.sightings.find(geo_query, {'_id': False}))
     except Exception as e:
         logger.error(f"Error getting sightings: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/wildlife/api/sightings/clusters', methods=['GET'])
+@versioned_response
+def get_sighting_clusters():
+    try:
+        logger.info("Getting sighting clusters")
+        try:
+            zoom = int(request.args.get('zoom', ''))
+            min_lon, min_lat, max_lon, max_lat = [float(value) for value in request.args.get('bbox', '-180,-90,180,90').split(',')]
+        except ValueError:
+            return jsonify({"error": "Invalid zoom or bbox"}), 400
+        if not (0 <= zoom <= MAX_ZOOM and -180 <= min_lon < max_lon <= 180 and -90 <= min_lat < max_lat <= 90):
+            return jsonify({"error": "Invalid zoom or bbox"}), 400
+
+        # Count tiles from the index ranges before building any, so a deep zoom over a large bbox is cheap to reject
+        xs, ys = tile_ranges(zoom, min_lon, min_lat, max_lon, max_lat)
+        if len(xs) * len(ys) > CLUSTER_MAX_TILES:
+            if 'bbox' not in request.args:
+                # The default bbox is the whole world, which only fits in CLUSTER_MAX_TILES at low zooms
+                return jsonify({"error": "bbox is required at this zoom"}), 400
+            return jsonify({"error": f"Viewport covers too many tiles (max {CLUSTER_MAX_TILES})"}), 400
+        tiles = [(x, y) for x in xs for y in ys]
+
+        version = current_data_version()
+        clusters = []
+        for x, y in tiles:
+            clusters.extend(get_tile_clusters(zoom, x, y, version))
+        return jsonify({
+            "zoom": zoom,
+            "data_version": version,
+            "clusters": clusters
+        }), 200
+    except Exception as e:
+        logger.error(f"Error getting sighting clusters: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/wildlife/api/sightings/counts', methods=['GET'])
+def get_sighting_counts():
+    try:
+        logger.info("Getting sighting counts")
+        state = db.rollup_state.find_one({"_id": "sightings"}, {'watermark': True})
+        as_of = state.get('watermark') if state else None
+        if as_of is not None:
+            source, key = db.sightings_rollups, "$sightings"
+        else:
+            # Rollups are still being built for the first time
+            source, key = db.sightings, 1
+        species = {}
+        for row in source.aggregate([{"$group": {"_id": "$species", "sightings": {"$sum": key}}}]):
+            species[row['_id'] or 'Unknown'] = species.get(row['_id'] or 'Unknown', 0) + row['sightings']
+        return jsonify({
+            "total": sum(species.values()),
+            "species": species,
+            "as_of": as_of
+        }), 200
+    except Exception as e:
+        logger.error(f"Error getting sighting counts: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/wildlife/api/sightings/stats', methods=['GET'])
+def get_sighting_stats():
+    try:
+        logger.info("Getting sighting stats")
+        group_by = [field.strip() for field in request.args.get('group_by', 'species').split(',') if field.strip()]
+        if any(field not in ROLLUP_GROUP_FIELDS for field in group_by):
+            return jsonify({"error": f"group_by must be a combination of {', '.join(ROLLUP_GROUP_FIELDS)}"}), 400
+        match = {}
+        try:
+            if request.args.get('from'):
+                match.setdefault('day', {})['$gte'] = datetime.strptime(request.args['from'], '%Y-%m-%d')
+            if request.args.get('to'):
+                match.setdefault('day', {})['$lte'] = datetime.strptime(request.args['to'], '%Y-%m-%d')
+        except ValueError:
+            return jsonify({"error": "Invalid from or to (expected YYYY-MM-DD)"}), 400
+        if request.args.get('species'):
+            match['species'] = {"$in": request.args['species'].split(',')}
+
+        keys = {"day": "$day", "species": "$species", "cell": ["$cell_x", "$cell_y"]}
+        pipeline = [
+            {"$match": match},
+            {"$group": {
+                "_id": {field: keys[field] for field in group_by} or None,
+                "sightings": {"$sum": "$sightings"},
+                "animals": {"$sum": "$animals"}
+            }}
+        ]
+        if group_by:
+            pipeline.append({"$sort": {f"_id.{field}": ASCENDING for field in group_by}})
+
+        buckets = []
+        for row in db.sightings_rollups.aggregate(pipeline):
+            bucket = dict(row['_id'] or {})
+            if 'day' in bucket:
+                bucket['day'] = bucket['day'].date().isoformat()
+            if 'cell' in bucket:
+                bucket['cell'] = cell_bounds(*bucket['cell'])
+            bucket['sightings'] = row['sightings']
+            bucket['animals'] = row['animals']
+            buckets.append(bucket)
+        state = db.rollup_state.find_one({"_id": "sightings"}, {'watermark': True})
+        return jsonify({
+            "group_by": group_by,
+            "buckets": buckets,
+            "total": {
+                "sightings": sum(bucket['sightings'] for bucket in buckets),
+                "animals": sum(bucket['animals'] for bucket in buckets)
+            },
+            # Rollups include every sightings change up to this time
+            "as_of": state.get('watermark') if state else None
+        }), 200
+    except Exception as e:
+        logger.error(f"Error getting sighting stats: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/wildlife/api/sightings/batch', methods=['GET', 'POST'])
+def get_sightings_batch():
+    try:
+        if request.method == 'POST':
+            body = request.get_json(silent=True)
+            ids = body.get('ids') if isinstance(body, dict) else None
+            if not isinstance(ids, list) or not all(isinstance(sighting_id, str) for sighting_id in ids):
+                return jsonify({"error": "Body must be {\"ids\": [...]}"}), 400
+        else:
+            ids = request.args.get('ids', '').split(',')
+        # Keep the first occurrence of each id so results follow the request order
+        ids = list(dict.fromkeys(sighting_id.strip() for sighting_id in ids if sighting_id.strip()))
+        if not ids:
+            return jsonify({"error": "Missing ids"}), 400
+        if len(ids) > MAX_PAGE_SIZE:
+            return jsonify({"error": f"Too many ids (max {MAX_PAGE_SIZE})"}), 400
+        logger.info(f"Getting {len(ids)} sightings by id")
+
+        projection = None
+        if request.args.get('fields'):
+            try:
+                projection = {name: True for name in parse_fields(request.args['fields'])}
+            except ValueError:
+                return jsonify({"error": "Invalid fields parameter"}), 400
+            # id is always returned so results can be matched to the request
+            projection['id'] = True
+
+        # Key each document by whichever requested identifier matched it, preferring id over _id
+        by_id, by_object_id = {}, {}
+        for doc in db.sightings.find(sighting_id_query(ids), projection):
+            object_id = str(doc.pop('_id'))
+            doc.setdefault('id', object_id)
+            by_id[doc['id']] = doc
+            by_object_id[object_id] = doc
+        found = {sighting_id: by_id.get(sighting_id) or by_object_id[sighting_id]
+                 for sighting_id in ids if sighting_id in by_id or sighting_id in by_object_id}
+        return jsonify({
+            "items": [found[sighting_id] for sighting_id in ids if sighting_id in found],
+            "missing": [sighting_id for sighting_id in ids if sighting_id not in found]
+        }), 200
+    except Exception as e:
+        logger.error(f"Error getting sightings batch: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/wildlife/api/sightings/<sighting_id>', methods=['GET'])
 def get_sighting(sighting_id):
     try:
         logger.info(f"Getting sighting {sighting_id}")
-        sighting = db.sightings.find_one({"id": sighting_id}, {'_id': False})
+        sighting = db.sightings.find_one(sighting_id_query([sighting_id]))
         if sighting:
+            sighting.setdefault('id', str(sighting['_id']))
+            sighting.pop('_id')
             return jsonify(sighting), 200
         else:
             return jsonify({"error": "Sighting not found"}), 404
@@ -82,6 +928,14 @@ def get_sighting(sighting_id):
         logger.error(f"Error getting sighting: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+@app.cli.command('rebuild-rollups')
+@click.option('--from', 'start', type=click.DateTime(formats=['%Y-%m-%d']), help='First UTC day to rebuild')
+@click.option('--to', 'end', type=click.DateTime(formats=['%Y-%m-%d']), help='Last UTC day to rebuild')
+def rebuild_rollups_command(start, end):
+    """Recompute sightings rollups after a backfill: flask --app app rebuild-rollups --from 2024-01-01"""
+    days = rebuild_rollups(start, end + timedelta(days=1) if end else None)
+    click.echo(f"Rebuilt sightings rollups for {days} days")
+
 if __name__ == '__main__':
     logger.info("Starting dataapi service")
     app.run(host='0.0.0.0', port=5000)  # nosec B104, nosemgrep: avoid_app_run_with_bad_host - Required for containerized deployment: 0.0.0.0 binding allows ECS Service Connect and ALB to reach container
\ No newline at end of file
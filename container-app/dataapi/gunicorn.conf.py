@@ -0,0 +1,49 @@
+# DataAPI Service - Gunicorn settings for production serving, overridable through environment variables
+
+import os
+import time
+
+# gthread workers keep a pool of request threads per process; gevent can be used where it is installed
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"  # nosec B104 - Required for containerized deployment: ECS Service Connect and ALB reach the container on this port
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+workers = int(os.getenv('GUNICORN_WORKERS', '2'))
+threads = int(os.getenv('GUNICORN_THREADS', '8'))
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', '1000'))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '75'))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '60'))
+# ECS waits 30 seconds after SIGTERM before SIGKILL, so finish in-flight requests within that window
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '25'))
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '0'))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', '0'))
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', None)
+errorlog = '-'
+
+# Each worker imports app.py after the fork, so the MongoClient and background threads
+# are created inside the process that uses them instead of being inherited across fork
+preload_app = False
+
+MONGO_URI = os.getenv('MONGO_URI', 'mongodb://wildlife-datadb.wildlife:27017')
+STARTUP_RETRY_DEADLINE = float(os.getenv('STARTUP_RETRY_DEADLINE', '1800'))
+STARTUP_RETRY_MAX_DELAY = float(os.getenv('STARTUP_RETRY_MAX_DELAY', '30'))
+
+def on_starting(server):
+    """Wait for MongoDB in the master so workers are not killed by the boot timeout while it starts"""
+    from pymongo import MongoClient
+
+    give_up_at = time.monotonic() + STARTUP_RETRY_DEADLINE
+    delay = 1
+    while True:
+        client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=5000)
+        try:
+            client.admin.command('ping')
+            server.log.info("MongoDB is reachable, starting workers")
+            return
+        except Exception as e:
+            if time.monotonic() + delay > give_up_at:
+                raise
+            server.log.warning(f"Waiting for MongoDB: {str(e)}")
+        finally:
+            # Never leave a client open in the master across the fork
+            client.close()
+        time.sleep(delay)
+        delay = min(STARTUP_RETRY_MAX_DELAY, delay * 2)
@@ -1,10 +1,16 @@
 # Frontend Service - Web interface for rangers to view and submit wildlife sightings
 
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
-from flask import Flask, redirect, render_template, jsonify, request
+from flask import Flask, Response, redirect, render_template, jsonify, request, stream_with_context
 import requests
+from requests.adapters import HTTPAdapter
 import os
+import json
 import logging
+import math
+import random
+import threading
 import time
 import re
 from aws_xray_sdk.core import xray_recorder, patch_all
@@ -30,26 +36,215 @@ logger.info("initializing xray middleware")
 # Add X-Ray middleware to Flask
 XRayMiddleware(app, xray_recorder)
 
-# Simple retry mechanism: 60 attempts with 30-second delay (30 minutes total)
-def connect_with_retry(connect_func, service_name, max_attempts=60, delay=30):
-    logger.info(f"Connecting to {service_name} with retry logic...")
-    
-    for attempt in range(max_attempts):
+# Internal upstream services, each with its own keep-alive connection pool
+HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', '20'))
+HTTP_POOL_BLOCK = os.getenv('HTTP_POOL_BLOCK', 'false').lower() == 'true'
+HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', '3'))
+UPSTREAMS = {
+    'dataapi': {
+        'url': os.getenv('DATAAPI_URL', 'http://wildlife-dataapi.wildlife:5000'),
+        'timeout': float(os.getenv('DATAAPI_TIMEOUT', '10'))
+    },
+    'media': {
+        'url': os.getenv('MEDIA_URL', 'http://wildlife-media.wildlife:5000'),
+        'timeout': float(os.getenv('MEDIA_TIMEOUT', '30'))
+    },
+    'alerts': {
+        'url': os.getenv('ALERTS_URL', 'http://wildlife-alerts.wildlife:5000'),
+        'timeout': float(os.getenv('ALERTS_TIMEOUT', '10'))
+    }
+}
+
+def create_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_POOL_SIZE, pool_block=HTTP_POOL_BLOCK)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+sessions = {name: create_session() for name in UPSTREAMS}
+upstream_stats = {name: {"requests": 0, "errors": 0, "retries": 0, "in_flight": 0, "max_in_flight": 0} for name in UPSTREAMS}
+upstream_stats_lock = threading.Lock()
+
+# Request path resilience: each call gets a deadline budget (the upstream timeout by default),
+# idempotent calls are retried with jittered backoff inside that budget, and a circuit breaker
+# per upstream fails calls fast while a backend is down instead of holding request threads
+UPSTREAM_RETRY_ATTEMPTS = int(os.getenv('UPSTREAM_RETRY_ATTEMPTS', '3'))
+UPSTREAM_RETRY_BASE_DELAY = float(os.getenv('UPSTREAM_RETRY_BASE_DELAY', '0.1'))
+UPSTREAM_RETRY_MAX_DELAY = float(os.getenv('UPSTREAM_RETRY_MAX_DELAY', '1'))
+BREAKER_FAILURE_THRESHOLD = int(os.getenv('BREAKER_FAILURE_THRESHOLD', '5'))
+BREAKER_RESET_TIMEOUT = float(os.getenv('BREAKER_RESET_TIMEOUT', '30'))
+RETRYABLE_METHODS = {'GET', 'HEAD'}
+RETRYABLE_STATUS_CODES = {502, 503, 504}
+
+class UpstreamUnavailable(Exception):
+    """Raised when an upstream is unreachable within the request budget or its circuit is open"""
+
+    def __init__(self, upstream, message):
+        super().__init__(message)
+        self.upstream = upstream
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker counting consecutive failures for one upstream"""
+
+    def __init__(self, name, failure_threshold=BREAKER_FAILURE_THRESHOLD, reset_timeout=BREAKER_RESET_TIMEOUT):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self.consecutive_failures = 0
+        self.opened_at = 0
+        self.trial_in_flight = False
+        self.stats = {"opened": 0, "rejected": 0, "failures": 0, "successes": 0}
+        self.lock = threading.Lock()
+
+    def allow(self):
+        """Whether a call may go out now; after the cooldown a single trial call is let through"""
+        with self.lock:
+            if self.state == 'open':
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    self.stats['rejected'] += 1
+                    return False
+                self.state = 'half_open'
+                self.trial_in_flight = False
+            if self.state == 'half_open':
+                if self.trial_in_flight:
+                    self.stats['rejected'] += 1
+                    return False
+                self.trial_in_flight = True
+            return True
+
+    def record_success(self):
+        with self.lock:
+            self.stats['successes'] += 1
+            self.consecutive_failures = 0
+            self.trial_in_flight = False
+            if self.state != 'closed':
+                logger.info(f"Circuit for {self.name} closed")
+            self.state = 'closed'
+
+    def record_failure(self):
+        with self.lock:
+            self.stats['failures'] += 1
+            self.consecutive_failures += 1
+            self.trial_in_flight = False
+            if self.state == 'half_open' or (self.state == 'closed' and self.consecutive_failures >= self.failure_threshold):
+                self.state = 'open'
+                self.opened_at = time.monotonic()
+                self.stats['opened'] += 1
+                logger.warning(f"Circuit for {self.name} opened after {self.consecutive_failures} consecutive failures")
+
+    def retry_after(self):
+        """Seconds until the breaker lets a trial call through"""
+        with self.lock:
+            if self.state != 'open':
+                return 0
+            return max(0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+    def snapshot(self):
+        with self.lock:
+            return {"state": self.state, "consecutive_failures": self.consecutive_failures, **self.stats}
+
+breakers = {name: CircuitBreaker(name) for name in UPSTREAMS}
+
+def backoff_delay(attempt):
+    """Full-jitter exponential backoff for the given retry attempt"""
+    return random.uniform(0, min(UPSTREAM_RETRY_MAX_DELAY, UPSTREAM_RETRY_BASE_DELAY * 2 ** (attempt - 1)))
+
+def send_upstream(upstream, method, url, **kwargs):
+    """Send a single attempt over the upstream's pooled keep-alive session, tracking pool usage"""
+    stats = upstream_stats[upstream]
+    with upstream_stats_lock:
+        stats['in_flight'] += 1
+        stats['max_in_flight'] = max(stats['max_in_flight'], stats['in_flight'])
+    try:
+        return sessions[upstream].request(method, url, **kwargs)
+    except Exception:
+        with upstream_stats_lock:
+            stats['errors'] += 1
+        raise
+    finally:
+        with upstream_stats_lock:
+            stats['in_flight'] -= 1
+
+def upstream_request(upstream, method, path, budget=None, **kwargs):
+    """Send a request to an internal service within a deadline budget, retrying idempotent calls"""
+    config = UPSTREAMS[upstream]
+    breaker = breakers[upstream]
+    budget = config['timeout'] if budget is None else budget
+    deadline = time.monotonic() + budget
+    attempts = UPSTREAM_RETRY_ATTEMPTS if method in RETRYABLE_METHODS else 1
+    with upstream_stats_lock:
+        upstream_stats[upstream]['requests'] += 1
+
+    for attempt in range(1, attempts + 1):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise UpstreamUnavailable(upstream, f"{upstream} did not respond within {budget:.1f}s")
+        if not breaker.allow():
+            raise UpstreamUnavailable(upstream, f"{upstream} circuit is open")
+
         try:
-            result = connect_func()
-            # Check for HTTP errors and raise exception if status indicates failure
-            if hasattr(result, 'raise_for_status'):
-                result.raise_for_status()
-            logger.info(f"Successfully connected to {service_name} on attempt {attempt+1}")
-            return result
-        except Exception as e:
-            if attempt < max_attempts - 1:
-                logger.warning(f"Connection to {service_name} failed (attempt {attempt+1}/{max_attempts}): {str(e)}")
-                logger.info(f"Retrying in {delay} seconds...")
-                time.sleep(delay)
-            else:
-                logger.warning(f"Failed to connect to {service_name} after {max_attempts} attempts (30 minutes)")
-                raise
+            response = send_upstream(
+                upstream, method, f"{config['url']}{path}",
+                timeout=(min(HTTP_CONNECT_TIMEOUT, remaining), remaining),
+                **kwargs
+            )
+        except (requests.ConnectionError, requests.Timeout) as e:
+            breaker.record_failure()
+            error = e
+            response = None
+        except Exception:
+            breaker.record_failure()
+            raise
+
+        if response is not None:
+            if response.status_code < 500:
+                breaker.record_success()
+                return response
+            breaker.record_failure()
+            if response.status_code not in RETRYABLE_STATUS_CODES or attempt == attempts:
+                return response
+
+        # Only back off if the retry can still start inside the budget
+        delay = backoff_delay(attempt)
+        if attempt == attempts or time.monotonic() + delay >= deadline:
+            break
+        if response is not None:
+            response.close()
+        logger.warning(f"Retrying {method} {upstream}{path} (attempt {attempt + 1}/{attempts}) in {delay:.2f}s")
+        with upstream_stats_lock:
+            upstream_stats[upstream]['retries'] += 1
+        time.sleep(delay)
+
+    if response is not None:
+        return response
+    raise UpstreamUnavailable(upstream, f"{upstream} unavailable: {error}") from error
+
+def unavailable_response(error):
+    """503 with a Retry-After hint for a request that failed fast"""
+    logger.warning(f"Failing fast: {str(error)}")
+    response = jsonify({"error": str(error)})
+    response.headers['Retry-After'] = str(max(1, math.ceil(breakers[error.upstream].retry_after())))
+    return response, 503
+
+def pool_metrics(upstream):
+    """Report connection pool utilization for an upstream"""
+    with upstream_stats_lock:
+        metrics = dict(upstream_stats[upstream])
+    metrics['pool_size'] = HTTP_POOL_SIZE
+    metrics['circuit'] = breakers[upstream].snapshot()
+    metrics['connections_opened'] = 0
+    metrics['idle_connections'] = 0
+    poolmanager = sessions[upstream].get_adapter(UPSTREAMS[upstream]['url']).poolmanager
+    for key in poolmanager.pools.keys():
+        pool = poolmanager.pools.get(key)
+        if pool is None:
+            continue
+        metrics['connections_opened'] += pool.num_connections
+        # The pool queue holds idle connections plus None placeholders for unopened slots
+        metrics['idle_connections'] += sum(1 for conn in list(pool.pool.queue) if conn is not None)
+    return metrics
 
 CACHE_HEADERS = {
     'Cache-Control': 'no-cache, no-store, must-revalidate, max-age=0',
@@ -63,6 +258,95 @@ def add_cache_headers(response):
         response.headers[key] = value
     return response
 
+# Headers relayed between the browser and the media service for streamed images
+IMAGE_REQUEST_HEADERS = ['Range', 'If-None-Match']
+IMAGE_RESPONSE_HEADERS = ['Content-Type', 'Content-Length', 'Content-Range', 'Accept-Ranges', 'ETag', 'Last-Modified', 'Cache-Control', 'Location']
+IMAGE_CHUNK_SIZE = int(os.getenv('IMAGE_CHUNK_SIZE', str(64 * 1024)))
+
+def relay_stream(response):
+    """Relay a streamed upstream response to the client, returning its connection to the pool when done"""
+    def generate():
+        try:
+            for chunk in response.iter_content(IMAGE_CHUNK_SIZE):
+                yield chunk
+        finally:
+            response.close()
+
+    headers = {key: response.headers[key] for key in IMAGE_RESPONSE_HEADERS if key in response.headers}
+    return Response(stream_with_context(generate()), status=response.status_code, headers=headers)
+
+# Connection-level headers describe one hop only and are never forwarded
+HOP_BY_HOP_HEADERS = {'connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization', 'te', 'trailer', 'transfer-encoding', 'upgrade'}
+
+def relay_response(response):
+    """Relay an upstream API response as it arrives, without its hop-by-hop headers"""
+    def generate():
+        try:
+            for chunk in response.iter_content(IMAGE_CHUNK_SIZE):
+                yield chunk
+        finally:
+            response.close()
+
+    dropped = set(HOP_BY_HOP_HEADERS)
+    if 'Content-Encoding' in response.headers:
+        # iter_content decodes the body, so the upstream encoding and length no longer apply
+        dropped.update({'content-encoding', 'content-length'})
+    headers = [(key, value) for key, value in response.headers.items() if key.lower() not in dropped]
+    return Response(stream_with_context(generate()), status=response.status_code, headers=headers)
+
+# GPS push events are relayed as they arrive; the read timeout only has to outlast the stream's keepalive
+GPS_STREAM_READ_TIMEOUT = float(os.getenv('GPS_STREAM_READ_TIMEOUT', '60'))
+
+def relay_events(response):
+    """Relay a server-sent event stream without buffering, closing the upstream when the client leaves"""
+    def generate():
+        try:
+            for chunk in response.iter_content(chunk_size=None):
+                yield chunk
+        finally:
+            response.close()
+
+    headers = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    if 'Content-Type' in response.headers:
+        headers['Content-Type'] = response.headers['Content-Type']
+    return Response(stream_with_context(generate()), status=response.status_code, headers=headers)
+
+# Request headers passed through to read APIs so conditional GETs reach the backend
+CONDITIONAL_HEADERS = ['If-None-Match', 'If-Modified-Since', 'Accept']
+
+def conditional_headers():
+    """Collect the client's conditional request headers for forwarding upstream"""
+    return {key: request.headers[key] for key in CONDITIONAL_HEADERS if key in request.headers}
+
+# Aggregated dashboard: one browser round trip, with the upstream reads fetched concurrently.
+# Under the gevent worker the fan-out threads are greenlets, so a task holds many dashboards in flight.
+DASHBOARD_BUDGET = float(os.getenv('DASHBOARD_BUDGET', '5'))
+# Sections are buffered here to splice them together, so GPS is capped to the newest fixes
+# (enough for the latest-per-collar table) rather than the whole 24 hour window
+DASHBOARD_GPS_LIMIT = int(os.getenv('DASHBOARD_GPS_LIMIT', '1000'))
+DASHBOARD_SECTIONS = {
+    'sightings': ('dataapi', '/wildlife/api/sightings'),
+    'counts': ('dataapi', '/wildlife/api/sightings/counts'),
+    'gps': ('alerts', '/wildlife/api/gps')
+}
+fanout_pool = ThreadPoolExecutor(max_workers=int(os.getenv('FANOUT_WORKERS', '64')), thread_name_prefix='upstream-fanout')
+
+def fetch_section(trace_entity, upstream, path, params):
+    """Fetch one dashboard section on a pool thread, returning its raw JSON body or an error"""
+    # Continue the request's X-Ray trace so the upstream call is recorded under it
+    if trace_entity is not None:
+        xray_recorder.set_trace_entity(trace_entity)
+    try:
+        response = upstream_request(upstream, 'GET', path, params=params, budget=DASHBOARD_BUDGET)  # nosemgrep: request-with-http - Internal service communication
+        if response.status_code != 200:
+            return None, f"{upstream} returned {response.status_code}"
+        return response.content, None
+    except Exception as e:
+        return None, str(e)
+    finally:
+        if trace_entity is not None:
+            xray_recorder.clear_trace_entities()
+
 @app.route('/wildlife')
 def wildlife_root():
     return redirect('/wildlife/')
@@ -89,42 +373,109 @@ def health_check():
         "xray": "enabled"
     }), 200
 
+@app.route('/wildlife/api/upstreams', methods=['GET'])
+def get_upstream_metrics():
+    return jsonify({name: pool_metrics(name) for name in UPSTREAMS}), 200
+
 @app.route('/wildlife/api/sightings', methods=['POST'])
 def report_sighting():
     try:
         logger.info("Reporting sighting")
-        # Forward the form data and files to the media service
-        files = None
-        if 'image' in request.files:
-            files = {'image': request.files['image']}
-        
-        response = connect_with_retry(
-            lambda: requests.post(  # nosemgrep: use-raise-for-status - Error handling already done by connect_with_retry function
-                'http://wildlife-media.wildlife:5000/wildlife/api/sightings',  # nosemgrep: request-with-http, use-raise-for-status - Internal service communication, error handling done by connect_with_retry
-                data=request.form,  # nosemgrep: ssrf-requests - Safe proxy to fixed internal service URL
-                files=files,
-                timeout=30
-            ),
-            'Media Service (wildlife-media)'
+        # Relay the multipart body to the media service as a stream without parsing it here.
+        # A consumed stream cannot be replayed, so this request is sent once rather than retried.
+        headers = {'Content-Type': request.content_type}
+        if request.content_length is not None:
+            headers['Content-Length'] = str(request.content_length)
+        response = upstream_request(  # nosemgrep: use-raise-for-status - Status is passed through to the client
+            'media', 'POST', '/wildlife/api/sightings',
+            data=request.stream,  # nosemgrep: ssrf-requests - Safe proxy to fixed internal service URL
+            headers=headers
         )
-        return response.content, response.status_code, response.headers.items()
+        return relay_response(response)
+    except UpstreamUnavailable as e:
+        return unavailable_response(e)
     except Exception as e:
         logger.error(f"Error reporting sighting: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/wildlife/api/sightings/<sighting_id>/status', methods=['GET'])
+def get_sighting_status(sighting_id):
+    try:
+        if not re.match(r'^[a-zA-Z0-9_-]+$', sighting_id):
+            return jsonify({"error": "Invalid sighting id"}), 400
+        logger.info(f"Getting sighting status: {sighting_id}")
+        response = upstream_request('media', 'GET', f'/wildlife/api/sightings/{sighting_id}/status')  # nosemgrep: request-with-http, use-raise-for-status - Internal service communication, status is passed through to the client
+        return relay_response(response)
+    except UpstreamUnavailable as e:
+        return unavailable_response(e)
+    except Exception as e:
+        logger.error(f"Error getting sighting status: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/wildlife/api/uploads', methods=['POST'])
+@app.route('/wildlife/api/uploads/complete', methods=['POST'])
+def proxy_uploads():
+    try:
+        logger.info(f"Proxying upload request: {request.path}")
+        response = upstream_request('media', 'POST', request.path, json=request.get_json(silent=True))  # nosemgrep: request-with-http, ssrf-requests, use-raise-for-status - Internal service communication to a fixed route, status is passed through to the client
+        return relay_response(response)
+    except UpstreamUnavailable as e:
+        return unavailable_response(e)
+    except Exception as e:
+        logger.error(f"Error with upload request: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/wildlife/api/sightings', methods=['GET'])
 def get_sightings():
     try:
         logger.info("Getting sightings")
-        response = connect_with_retry(
-            lambda: requests.get('http://wildlife-dataapi.wildlife:5000/wildlife/api/sightings', timeout=10),  # nosemgrep: request-with-http, use-raise-for-status - Internal service communication, error handling done by connect_with_retry
-            'DataAPI Service (wildlife-dataapi)'
-        )
-        return response.content, response.status_code, response.headers.items()
+        response = upstream_request('dataapi', 'GET', '/wildlife/api/sightings', params=request.args, headers=conditional_headers(), stream=True)  # nosemgrep: request-with-http, use-raise-for-status - Internal service communication, status is passed through to the client
+        return relay_response(response)
+    except UpstreamUnavailable as e:
+        return unavailable_response(e)
     except Exception as e:
         logger.error(f"Error getting sightings: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/wildlife/api/sightings/clusters', methods=['GET'])
+def get_sighting_clusters():
+    try:
+        logger.info("Getting sighting clusters")
+        response = upstream_request('dataapi', 'GET', '/wildlife/api/sightings/clusters', params=request.args, headers=conditional_headers())  # nosemgrep: request-with-http, use-raise-for-status - Internal service communication, status is passed through to the client
+        return relay_response(response)
+    except UpstreamUnavailable as e:
+        return unavailable_response(e)
+    except Exception as e:
+        logger.error(f"Error getting sighting clusters: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/wildlife/api/sightings/batch', methods=['GET', 'POST'])
+def get_sightings_batch():
+    try:
+        logger.info("Getting sightings batch")
+        if request.method == 'GET':
+            response = upstream_request('dataapi', 'GET', '/wildlife/api/sightings/batch', params=request.args)  # nosemgrep: request-with-http, use-raise-for-status - Internal service communication, status is passed through to the client
+        else:
+            response = upstream_request('dataapi', 'POST', '/wildlife/api/sightings/batch', params=request.args, json=request.get_json(silent=True))  # nosemgrep: request-with-http, ssrf-requests, use-raise-for-status - Internal service communication, status is passed through to the client
+        return relay_response(response)
+    except UpstreamUnavailable as e:
+        return unavailable_response(e)
+    except Exception as e:
+        logger.error(f"Error getting sightings batch: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/wildlife/api/sightings/stats', methods=['GET'])
+def get_sighting_stats():
+    try:
+        logger.info("Getting sighting stats")
+        response = upstream_request('dataapi', 'GET', '/wildlife/api/sightings/stats', params=request.args)  # nosemgrep: request-with-http, use-raise-for-status - Internal service communication, status is passed through to the client
+        return relay_response(response)
+    except UpstreamUnavailable as e:
+        return unavailable_response(e)
+    except Exception as e:
+        logger.error(f"Error getting sighting stats: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/wildlife/api/images/<path:image_key>')
 def get_image(image_key):
     try:
@@ -142,11 +493,17 @@ def get_image(image_key):
             return jsonify({"error": "Invalid image path"}), 400
         
         logger.info(f"Getting image: {image_key}")
-        response = connect_with_retry(
-            lambda: requests.get(f'http://wildlife-media.wildlife:5000/wildlife/api/images/{image_key}', timeout=10),  # nosemgrep: request-with-http, use-raise-for-status - Internal service communication, error handling done by connect_with_retry
-            'Media Service (wildlife-media)'
+        response = upstream_request(  # nosemgrep: request-with-http, use-raise-for-status - Internal service communication, status is passed through to the client
+            'media', 'GET', f'/wildlife/api/images/{image_key}',
+            params=request.args,
+            headers={key: request.headers[key] for key in IMAGE_REQUEST_HEADERS if key in request.headers},
+            stream=True,
+            # Presigned redirects are relayed to the browser, which then reads from S3 directly
+            allow_redirects=False
         )
-        return response.content, response.status_code, response.headers.items()
+        return relay_stream(response)
+    except UpstreamUnavailable as e:
+        return unavailable_response(e)
     except Exception as e:
         logger.error(f"Error getting image: {str(e)}")
         return jsonify({"error": str(e)}), 500
@@ -156,21 +513,145 @@ def proxy_gps():
     try:
         if request.method == 'GET':
             logger.info("Getting GPS data")
-            response = connect_with_retry(
-                lambda: requests.get('http://wildlife-alerts.wildlife:5000/wildlife/api/gps', timeout=10),  # nosemgrep: request-with-http, use-raise-for-status - Internal service communication, error handling done by connect_with_retry
-                'Alerts Service (wildlife-alerts)'
-            )
+            response = upstream_request('alerts', 'GET', '/wildlife/api/gps', params=request.args, headers=conditional_headers(), stream=True)  # nosemgrep: request-with-http, use-raise-for-status - Internal service communication, status is passed through to the client
         else:
             logger.info("Posting GPS data")
-            response = connect_with_retry(
-                lambda: requests.post('http://wildlife-alerts.wildlife:5000/wildlife/api/gps', json=request.json, timeout=10),  # nosemgrep: request-with-http, ssrf-requests, use-raise-for-status - Internal service communication, error handling done by connect_with_retry
-                'Alerts Service (wildlife-alerts)'
-            )
-        return response.content, response.status_code, response.headers.items()
+            response = upstream_request('alerts', 'POST', '/wildlife/api/gps', json=request.json)  # nosemgrep: request-with-http, ssrf-requests, use-raise-for-status - Internal service communication, status is passed through to the client
+        return relay_response(response)
+    except UpstreamUnavailable as e:
+        return unavailable_response(e)
     except Exception as e:
         logger.error(f"Error with GPS data: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/wildlife/api/gps/trajectories', methods=['GET'])
+def get_gps_trajectories():
+    try:
+        logger.info("Getting GPS trajectories")
+        response = upstream_request('alerts', 'GET', '/wildlife/api/gps/trajectories', params=request.args)  # nosemgrep: request-with-http, use-raise-for-status - Internal service communication, status is passed through to the client
+        return relay_response(response)
+    except UpstreamUnavailable as e:
+        return unavailable_response(e)
+    except Exception as e:
+        logger.error(f"Error getting GPS trajectories: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/wildlife/api/gps/latest', methods=['GET'])
+def get_gps_latest():
+    try:
+        logger.info("Getting latest GPS positions")
+        response = upstream_request('alerts', 'GET', '/wildlife/api/gps/latest', params=request.args)  # nosemgrep: request-with-http, use-raise-for-status - Internal service communication, status is passed through to the client
+        return relay_response(response)
+    except UpstreamUnavailable as e:
+        return unavailable_response(e)
+    except Exception as e:
+        logger.error(f"Error getting latest GPS positions: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/wildlife/api/gps/stream', methods=['GET'])
+def proxy_gps_stream():
+    try:
+        logger.info("Opening GPS push stream")
+        headers = {'Last-Event-ID': request.headers['Last-Event-ID']} if 'Last-Event-ID' in request.headers else {}
+        response = upstream_request(  # nosemgrep: request-with-http, use-raise-for-status - Internal service communication, status is passed through to the client
+            'alerts', 'GET', '/wildlife/api/gps/stream',
+            params=request.args,
+            headers=headers,
+            stream=True,
+            budget=GPS_STREAM_READ_TIMEOUT
+        )
+        return relay_events(response)
+    except UpstreamUnavailable as e:
+        return unavailable_response(e)
+    except Exception as e:
+        logger.error(f"Error opening GPS stream: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/wildlife/api/gps/bulk', methods=['POST'])
+def proxy_gps_bulk():
+    try:
+        logger.info("Posting bulk GPS data")
+        # Streamed through unbuffered; the alerts service enforces the body size limit as it reads
+        headers = {'Content-Type': request.content_type or 'application/json'}
+        if request.content_length is not None:
+            headers['Content-Length'] = str(request.content_length)
+        response = upstream_request(  # nosemgrep: use-raise-for-status - Status is passed through to the client
+            'alerts', 'POST', '/wildlife/api/gps/bulk',
+            data=request.stream,  # nosemgrep: ssrf-requests - Safe proxy to fixed internal service URL
+            headers=headers,
+            budget=60
+        )
+        return relay_response(response)
+    except UpstreamUnavailable as e:
+        return unavailable_response(e)
+    except Exception as e:
+        logger.error(f"Error with bulk GPS data: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/wildlife/api/geofences', methods=['GET', 'POST'])
+def proxy_geofences():
+    try:
+        if request.method == 'GET':
+            logger.info("Getting geofences")
+            response = upstream_request('alerts', 'GET', '/wildlife/api/geofences')  # nosemgrep: request-with-http, use-raise-for-status - Internal service communication, status is passed through to the client
+        else:
+            logger.info("Creating geofence")
+            response = upstream_request('alerts', 'POST', '/wildlife/api/geofences', json=request.get_json(silent=True))  # nosemgrep: request-with-http, ssrf-requests, use-raise-for-status - Internal service communication, status is passed through to the client
+        return relay_response(response)
+    except UpstreamUnavailable as e:
+        return unavailable_response(e)
+    except Exception as e:
+        logger.error(f"Error with geofences: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/wildlife/api/geofences/alerts', methods=['GET'])
+def get_geofence_alerts():
+    try:
+        logger.info("Getting geofence alerts")
+        response = upstream_request('alerts', 'GET', '/wildlife/api/geofences/alerts', params=request.args)  # nosemgrep: request-with-http, use-raise-for-status - Internal service communication, status is passed through to the client
+        return relay_response(response)
+    except UpstreamUnavailable as e:
+        return unavailable_response(e)
+    except Exception as e:
+        logger.error(f"Error getting geofence alerts: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/wildlife/api/dashboard', methods=['GET'])
+def get_dashboard():
+    try:
+        logger.info("Getting dashboard")
+        trace_entity = xray_recorder.get_trace_entity()
+        # Sightings come back as a delta from an empty watermark, so the page can sync changes from there
+        params = {
+            'sightings': {'since': '', **({'limit': request.args['limit']} if 'limit' in request.args else {})},
+            'gps': {'limit': DASHBOARD_GPS_LIMIT}
+        }
+        futures = {
+            section: fanout_pool.submit(fetch_section, trace_entity, upstream, path, params.get(section, {}))
+            for section, (upstream, path) in DASHBOARD_SECTIONS.items()
+        }
+        wait(futures.values(), timeout=DASHBOARD_BUDGET)
+
+        # Upstream bodies are already JSON, so splice them into the response rather than re-encoding
+        parts = []
+        errors = {}
+        for section, future in futures.items():
+            if not future.done():
+                errors[section] = f"timed out after {DASHBOARD_BUDGET:.1f}s"
+                continue
+            body, error = future.result()
+            if error is not None:
+                errors[section] = error
+                continue
+            parts.append(f'{json.dumps(section)}:'.encode() + body)
+        if len(errors) == len(DASHBOARD_SECTIONS):
+            return jsonify({"error": "Dashboard data unavailable", "errors": errors}), 503
+        parts.append(b'"errors":' + json.dumps(errors).encode())
+        return Response(b'{' + b','.join(parts) + b'}', mimetype='application/json'), 200
+    except Exception as e:
+        logger.error(f"Error getting dashboard: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
 if __name__ == '__main__':
     logger.info("Starting frontend service")
     app.run(host='0.0.0.0', port=5000)  # nosec B104, nosemgrep: avoid_app_run_with_bad_host - Required for containerized deployment: 0.0.0.0 binding allows ECS Service Connect and ALB to reach container
\ No newline at end of file
@@ -0,0 +1,23 @@
+# Frontend Service - Gunicorn settings for production serving, overridable through environment variables
+
+import os
+
+# The frontend only waits on upstream services, so it defaults to gevent workers: each worker serves
+# up to worker_connections requests as greenlets instead of one OS thread per request
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"  # nosec B104 - Required for containerized deployment: ECS Service Connect and ALB reach the container on this port
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gevent')
+workers = int(os.getenv('GUNICORN_WORKERS', '2'))
+threads = int(os.getenv('GUNICORN_THREADS', '16'))
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', '1000'))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '75'))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '60'))
+# ECS waits 30 seconds after SIGTERM before SIGKILL, so finish in-flight requests within that window
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '25'))
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '0'))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', '0'))
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', None)
+errorlog = '-'
+
+# Each worker imports app.py after the fork, so the pooled upstream sessions
+# are created inside the process that uses them instead of sharing sockets across fork
+preload_app = False
@@ -1,17 +1,32 @@
 # Media Service - Handles image upload, storage, and retrieval for wildlife sightings
 
-from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from io import BytesIO
+import hashlib
+import json
 import os
+import re
+import shutil
+import tempfile
+import threading
 import uuid
 import boto3
-from flask import Flask, jsonify, send_file, request
+from flask import Flask, Response, jsonify, redirect, request, send_file, stream_with_context
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError
-from pymongo import MongoClient
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import MongoClient, ReturnDocument
+from PIL import Image, ImageOps
 import logging
+import random
 import time
 from aws_xray_sdk.core import xray_recorder, patch_all
 from aws_xray_sdk.ext.flask.middleware import XRayMiddleware
+from werkzeug.http import http_date
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -30,23 +45,42 @@ logger.info("initializing xray middleware")
 # Add X-Ray middleware to Flask
 XRayMiddleware(app, xray_recorder)
 
-# Simple retry mechanism: 60 attempts with 30-second delay (30 minutes total)
-def connect_with_retry(connect_func, service_name, max_attempts=60, delay=30):
+# Startup retry policy: exponential backoff with jitter until the deadline (30 minutes by default).
+# Only used while the service starts; request handlers never sleep on retries.
+STARTUP_RETRY_DEADLINE = float(os.getenv('STARTUP_RETRY_DEADLINE', '1800'))
+STARTUP_RETRY_MAX_DELAY = float(os.getenv('STARTUP_RETRY_MAX_DELAY', '30'))
+
+def connect_with_retry(connect_func, service_name, deadline=STARTUP_RETRY_DEADLINE, base_delay=1, max_delay=STARTUP_RETRY_MAX_DELAY):
     logger.info(f"Connecting to {service_name} with retry logic...")
-    
-    for attempt in range(max_attempts):
+    give_up_at = time.monotonic() + deadline
+    attempt = 0
+    while True:
+        attempt += 1
         try:
             result = connect_func()
-            logger.info(f"Successfully connected to {service_name} on attempt {attempt+1}")
+            logger.info(f"Successfully connected to {service_name} on attempt {attempt}")
             return result
         except Exception as e:
-            if attempt < max_attempts - 1:
-                logger.warning(f"Connection to {service_name} failed (attempt {attempt+1}/{max_attempts}): {str(e)}")
-                logger.info(f"Retrying in {delay} seconds...")
-                time.sleep(delay)
-            else:
-                logger.warning(f"Failed to connect to {service_name} after {max_attempts} attempts (30 minutes)")
+            backoff = min(max_delay, base_delay * 2 ** (attempt - 1))
+            delay = backoff / 2 + random.uniform(0, backoff / 2)
+            if time.monotonic() + delay > give_up_at:
+                logger.warning(f"Failed to connect to {service_name} after {attempt} attempts ({deadline:.0f} second deadline)")
                 raise
+            logger.warning(f"Connection to {service_name} failed (attempt {attempt}): {str(e)}")
+            logger.info(f"Retrying in {delay:.1f} seconds...")
+            time.sleep(delay)
+
+MONGO_URI = os.getenv('MONGO_URI', 'mongodb://wildlife-datadb.wildlife:27017')
+
+def connect_mongo():
+    """Create the MongoDB client and check the server is reachable (MongoClient itself connects lazily)"""
+    client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=5000)
+    try:
+        client.admin.command('ping')
+    except Exception:
+        client.close()
+        raise
+    return client
 
 # Get environment variables from ECS task definition
 logger.info("Getting environment variables from task definition")
@@ -58,61 +92,662 @@ logger.info(f"Using BUCKET_NAME: {BUCKET_NAME}")
 
 # Initialize S3 client
 logger.info(f"Initializing S3 client for region {AWS_REGION}")
-s3 = boto3.client('s3', region_name=AWS_REGION)
+# S3_ENDPOINT_URL points the client at a local S3 stand-in such as moto for testing
+s3 = boto3.client(
+    's3',
+    region_name=AWS_REGION,
+    endpoint_url=os.getenv('S3_ENDPOINT_URL') or None,
+    config=Config(signature_version='s3v4')
+)
 
 # Initialize MongoDB client
 logger.info("Connecting to MongoDB")
 mongo_client = connect_with_retry(
-    lambda: MongoClient('mongodb://wildlife-datadb.wildlife:27017'),
+    connect_mongo,
     'MongoDB (wildlife-datadb)'
 )
 db = mongo_client.wildlife_db
 
 # Constants
 ALLOWED_IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif'}
+IMAGE_CHUNK_SIZE = int(os.getenv('IMAGE_CHUNK_SIZE', str(64 * 1024)))
+# Only single byte ranges are passed to S3; anything else is served in full
+RANGE_PATTERN = re.compile(r'^bytes=(\d+-\d*|-\d+)$')
 
-@xray_recorder.capture('s3_image_upload')
-def handle_image_upload(file):
-    """Handle image upload to S3"""
+# Presigned URL settings
+PRESIGNED_URL_EXPIRY = int(os.getenv('PRESIGNED_URL_EXPIRY', '900'))
+MAX_UPLOAD_BYTES = int(os.getenv('MAX_UPLOAD_BYTES', str(20 * 1024 * 1024)))
+UPLOAD_CONTENT_TYPES = {'image/jpeg': '.jpg', 'image/png': '.png', 'image/gif': '.gif'}
+UPLOAD_KEY_PATTERN = re.compile(r'^sightings/\d{8}/[0-9a-f-]{36}\.(jpg|jpeg|png|gif)$')
+# Sightings still waiting for their image after this long are marked failed and the upload discarded;
+# an issued upload key must also be claimed by a sighting within this window
+PENDING_IMAGE_EXPIRY = int(os.getenv('PENDING_IMAGE_EXPIRY', '3600'))
+PENDING_IMAGE_SWEEP_INTERVAL = int(os.getenv('PENDING_IMAGE_SWEEP_INTERVAL', '300'))
+
+# Streaming upload settings
+UPLOAD_PART_SIZE = int(os.getenv('UPLOAD_PART_SIZE', str(8 * 1024 * 1024)))
+UPLOAD_CONCURRENCY = int(os.getenv('UPLOAD_CONCURRENCY', '4'))
+UPLOAD_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=UPLOAD_PART_SIZE,
+    multipart_chunksize=UPLOAD_PART_SIZE,
+    max_concurrency=UPLOAD_CONCURRENCY
+)
+# Leading bytes identifying each accepted image type, with the extensions allowed for it
+IMAGE_SIGNATURES = [
+    (b'\xff\xd8\xff', 'image/jpeg', ('.jpg', '.jpeg')),
+    (b'\x89PNG\r\n\x1a\n', 'image/png', ('.png',)),
+    (b'GIF87a', 'image/gif', ('.gif',)),
+    (b'GIF89a', 'image/gif', ('.gif',))
+]
+
+# Werkzeug rejects larger request bodies with 413 while parsing, before anything is buffered
+app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_BYTES + 1024 * 1024
+
+def new_image_key(file_extension):
+    """Generate a unique S3 key for a new sighting image"""
+    return f"sightings/{datetime.now().strftime('%Y%m%d')}/{uuid.uuid4()}{file_extension}"
+
+# Image cache settings
+IMAGE_MEMORY_CACHE_BYTES = int(os.getenv('IMAGE_MEMORY_CACHE_BYTES', str(64 * 1024 * 1024)))
+IMAGE_MEMORY_MAX_OBJECT_BYTES = int(os.getenv('IMAGE_MEMORY_MAX_OBJECT_BYTES', str(512 * 1024)))
+IMAGE_DISK_CACHE_DIR = os.getenv('IMAGE_DISK_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'wildlife-image-cache'))
+IMAGE_DISK_CACHE_BYTES = int(os.getenv('IMAGE_DISK_CACHE_BYTES', str(1024 * 1024 * 1024)))
+IMAGE_DISK_MAX_OBJECT_BYTES = int(os.getenv('IMAGE_DISK_MAX_OBJECT_BYTES', str(32 * 1024 * 1024)))
+
+class ImageCache:
+    """Two-level LRU of S3 images: small hot objects in memory, larger ones on local disk.
+
+    Image keys are UUID paths that are never overwritten, so entries never need revalidating
+    against S3. Disk files are named after the key and ETag, with a .meta sidecar so a restarted
+    process (or another task sharing the directory) can index them again.
+    """
+
+    def __init__(self, memory_bytes, memory_max_object, disk_dir, disk_bytes, disk_max_object):
+        self.memory_bytes = memory_bytes
+        self.memory_max_object = memory_max_object
+        self.disk_dir = disk_dir
+        self.disk_bytes = disk_bytes
+        self.disk_max_object = disk_max_object
+        self.memory = OrderedDict()
+        self.disk = OrderedDict()
+        self.memory_used = 0
+        self.disk_used = 0
+        self.lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "memory_evictions": 0, "disk_evictions": 0}
+        os.makedirs(self.disk_dir, exist_ok=True)
+        # The directory may be shared and in use, so index what is there rather than clearing it
+        self.load_disk()
+
+    def load_disk(self):
+        """Index cached files already on disk, oldest first, trimming to the disk budget"""
+        entries = []
+        for name in os.listdir(self.disk_dir):
+            path = os.path.join(self.disk_dir, name)
+            try:
+                if name.endswith('.part'):
+                    # Abandoned partial writes; recent ones may still be filling in another process
+                    if time.time() - os.path.getmtime(path) > 3600:
+                        os.remove(path)
+                    continue
+                if not name.endswith('.meta'):
+                    continue
+                with open(path) as f:
+                    record = json.load(f)
+                meta = record['meta']
+                if meta.get('last_modified'):
+                    meta['last_modified'] = datetime.fromisoformat(meta['last_modified'])
+                data_path = path[:-len('.meta')]
+                entries.append((os.path.getmtime(data_path), record['key'], data_path, meta))
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+        for _, key, path, meta in sorted(entries, key=lambda entry: entry[0]):
+            if key not in self.disk:
+                self.disk[key] = (path, meta)
+                self.disk_used += meta['size']
+        self.evict_disk()
+        if self.disk:
+            logger.info(f"Indexed {len(self.disk)} cached images ({self.disk_used} bytes) from {self.disk_dir}")
+
+    def evict_disk(self):
+        """Drop the least recently used disk entries until the cache fits its budget"""
+        evicted = []
+        with self.lock:
+            while self.disk_used > self.disk_bytes:
+                _, (evicted_path, evicted_meta) = self.disk.popitem(last=False)
+                self.disk_used -= evicted_meta['size']
+                self.stats['disk_evictions'] += 1
+                evicted.append(evicted_path)
+        for evicted_path in evicted:
+            for path in (evicted_path, evicted_path + '.meta'):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def get(self, key):
+        """Return ('memory', bytes, meta), ('disk', path, meta) or None"""
+        with self.lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                body, meta = self.memory[key]
+                return 'memory', body, meta
+            if key in self.disk:
+                self.disk.move_to_end(key)
+                self.stats['disk_hits'] += 1
+                path, meta = self.disk[key]
+                return 'disk', path, meta
+            self.stats['misses'] += 1
+            return None
+
+    def discard(self, key):
+        """Drop a disk entry whose file has disappeared"""
+        with self.lock:
+            if key in self.disk:
+                self.disk_used -= self.disk.pop(key)[1]['size']
+
+    def put_memory(self, key, body, meta):
+        with self.lock:
+            if key in self.memory:
+                return
+            self.memory[key] = (body, meta)
+            self.memory_used += len(body)
+            while self.memory_used > self.memory_bytes:
+                _, (evicted, _) = self.memory.popitem(last=False)
+                self.memory_used -= len(evicted)
+                self.stats['memory_evictions'] += 1
+
+    def put_disk(self, key, tmp_path, meta):
+        path = os.path.join(self.disk_dir, hashlib.sha256(f"{key}|{meta['etag']}".encode()).hexdigest())
+        os.replace(tmp_path, path)
+        # The sidecar goes in last, so an indexed entry always has its complete body
+        record = {"key": key, "meta": {**meta, 'last_modified': meta['last_modified'].isoformat() if meta.get('last_modified') else None}}
+        with tempfile.NamedTemporaryFile('w', dir=self.disk_dir, suffix='.part', delete=False) as f:
+            json.dump(record, f)
+        os.replace(f.name, path + '.meta')
+        with self.lock:
+            if key in self.disk:
+                return
+            self.disk[key] = (path, meta)
+            self.disk_used += meta['size']
+        self.evict_disk()
+
+    def writer(self, key, meta):
+        """Return a writer that fills the cache while a full object streams, or None if it will not fit"""
+        if meta['size'] <= self.memory_max_object:
+            return MemoryCacheWriter(self, key, meta)
+        if meta['size'] <= self.disk_max_object:
+            return DiskCacheWriter(self, key, meta)
+        return None
+
+    def snapshot(self):
+        with self.lock:
+            stats = dict(self.stats)
+            stats.update({
+                "memory_entries": len(self.memory),
+                "memory_bytes": self.memory_used,
+                "memory_capacity": self.memory_bytes,
+                "disk_entries": len(self.disk),
+                "disk_bytes": self.disk_used,
+                "disk_capacity": self.disk_bytes
+            })
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_ratio'] = (stats['memory_hits'] + stats['disk_hits']) / lookups if lookups else 0.0
+        return stats
+
+class MemoryCacheWriter:
+    def __init__(self, cache, key, meta):
+        self.cache, self.key, self.meta = cache, key, meta
+        self.chunks = []
+
+    def write(self, chunk):
+        self.chunks.append(chunk)
+
+    def commit(self):
+        body = b''.join(self.chunks)
+        if len(body) == self.meta['size']:
+            self.cache.put_memory(self.key, body, self.meta)
+
+    def abort(self):
+        self.chunks = []
+
+class DiskCacheWriter:
+    def __init__(self, cache, key, meta):
+        self.cache, self.key, self.meta = cache, key, meta
+        self.file = tempfile.NamedTemporaryFile(dir=cache.disk_dir, suffix='.part', delete=False)
+        self.written = 0
+
+    def write(self, chunk):
+        self.file.write(chunk)
+        self.written += len(chunk)
+
+    def commit(self):
+        self.file.close()
+        if self.written == self.meta['size']:
+            self.cache.put_disk(self.key, self.file.name, self.meta)
+        else:
+            self.abort()
+
+    def abort(self):
+        self.file.close()
+        try:
+            os.remove(self.file.name)
+        except OSError:
+            pass
+
+image_cache = ImageCache(IMAGE_MEMORY_CACHE_BYTES, IMAGE_MEMORY_MAX_OBJECT_BYTES,
+                         IMAGE_DISK_CACHE_DIR, IMAGE_DISK_CACHE_BYTES, IMAGE_DISK_MAX_OBJECT_BYTES)
+
+def send_cached_image(level, source, meta):
+    """Serve a cached image, letting werkzeug handle Range and conditional requests"""
+    if level == 'disk':
+        return send_file(
+            source,
+            mimetype=meta['content_type'],
+            as_attachment=False,
+            conditional=True,
+            etag=meta['etag'],
+            last_modified=meta['last_modified']
+        )
+    response = Response(source, mimetype=meta['content_type'])
+    response.set_etag(meta['etag'])
+    response.last_modified = meta['last_modified']
+    return response.make_conditional(request, accept_ranges=True, complete_length=len(source))
+
+# Resized variants: longest edge in pixels, stored under variants/<size>/<original key>
+IMAGE_VARIANTS = {
+    'thumb': int(os.getenv('IMAGE_THUMB_SIZE', '200')),
+    'medium': int(os.getenv('IMAGE_MEDIUM_SIZE', '800'))
+}
+IMAGE_VARIANT_WORKERS = int(os.getenv('IMAGE_VARIANT_WORKERS', '2'))
+PIL_FORMATS = {'.jpg': 'JPEG', '.jpeg': 'JPEG', '.png': 'PNG', '.gif': 'GIF'}
+
+variant_pool = ThreadPoolExecutor(max_workers=IMAGE_VARIANT_WORKERS, thread_name_prefix='image-variants')
+
+def variant_key(image_key, size):
+    return f"variants/{size}/{image_key}"
+
+def render_variant(original, image_key, size):
+    """Resize original image bytes to a variant, returning (bytes, content type)"""
+    image_format = PIL_FORMATS[os.path.splitext(image_key)[1].lower()]
+    max_edge = IMAGE_VARIANTS[size]
+    with Image.open(BytesIO(original)) as image:
+        # Let the JPEG decoder downscale while decoding instead of after
+        image.draft('RGB', (max_edge, max_edge))
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((max_edge, max_edge))
+        if image_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        output = BytesIO()
+        image.save(output, format=image_format, optimize=True)
+    return output.getvalue(), Image.MIME[image_format]
+
+def store_variant(image_key, size, body, content_type):
+    s3.put_object(Bucket=BUCKET_NAME, Key=variant_key(image_key, size), Body=body, ContentType=content_type)
+
+def generate_variants(image_key):
+    """Create every resized variant of an uploaded image (runs on the variant pool)"""
+    try:
+        original = s3.get_object(Bucket=BUCKET_NAME, Key=image_key)['Body'].read()
+        for size in IMAGE_VARIANTS:
+            body, content_type = render_variant(original, image_key, size)
+            store_variant(image_key, size, body, content_type)
+        logger.info(f"Generated image variants for {image_key}")
+    except Exception as e:
+        logger.error(f"Error generating image variants for {image_key}: {str(e)}")
+
+def generate_variant_on_demand(image_key, size):
+    """Render a missing variant for this request, caching it and storing it to S3 in the background"""
+    logger.info(f"Generating {size} variant on demand: {image_key}")
+    original = s3.get_object(Bucket=BUCKET_NAME, Key=image_key)['Body'].read()
+    body, content_type = render_variant(original, image_key, size)
+    meta = {
+        'size': len(body),
+        # Matches the ETag S3 will assign to the single-part upload
+        'etag': hashlib.md5(body, usedforsecurity=False).hexdigest(),
+        'content_type': content_type,
+        'last_modified': datetime.utcnow()
+    }
+    if len(body) <= IMAGE_MEMORY_MAX_OBJECT_BYTES:
+        image_cache.put_memory(variant_key(image_key, size), body, meta)
+    variant_pool.submit(store_variant, image_key, size, body, content_type)
+    return body, meta
+
+# Streaming settings
+STREAM_BATCH_SIZE = int(os.getenv('STREAM_BATCH_SIZE', '500'))
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+def generate_json_array(cursor):
+    """Yield a JSON array one cursor batch at a time"""
+    yield '['
+    separator = ''
+    batch = []
+    for doc in cursor:
+        batch.append(app.json.dumps(doc))
+        if len(batch) >= STREAM_BATCH_SIZE:
+            yield separator + ','.join(batch)
+            separator = ','
+            batch = []
+    if batch:
+        yield separator + ','.join(batch)
+    yield ']'
+
+def generate_ndjson(cursor):
+    """Yield newline-delimited JSON one cursor batch at a time"""
+    batch = []
+    for doc in cursor:
+        batch.append(app.json.dumps(doc))
+        if len(batch) >= STREAM_BATCH_SIZE:
+            yield '\n'.join(batch) + '\n'
+            batch = []
+    if batch:
+        yield '\n'.join(batch) + '\n'
+
+def start_cursor(cursor):
+    """Fetch the first batch now, so a failing query raises before the 200 and its headers are sent"""
+    first = next(cursor, None)
+
+    def documents():
+        if first is not None:
+            yield first
+            yield from cursor
+    return documents()
+
+def stream_documents(cursor):
+    """Stream a MongoDB cursor as a JSON array, or as NDJSON when the client asks for it"""
+    cursor = start_cursor(cursor.batch_size(STREAM_BATCH_SIZE))
+    if request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE:
+        return Response(stream_with_context(generate_ndjson(cursor)), mimetype=NDJSON_MIMETYPE)
+    return Response(stream_with_context(generate_json_array(cursor)), mimetype='application/json')
+
+def sniff_image(file):
+    """Identify an upload from its first bytes, returning (content type, allowed extensions) or None"""
+    head = file.stream.read(16)
+    file.stream.seek(0)
+    return identify_image(head)
+
+def identify_image(head):
+    """Match the first bytes of an image against the known signatures"""
+    for signature, content_type, extensions in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return content_type, extensions
+    return None
+
+def upload_size(file):
+    """Size of a parsed upload, found by seeking rather than reading it"""
+    file.stream.seek(0, os.SEEK_END)
+    size = file.stream.tell()
+    file.stream.seek(0)
+    return size
+
+def validate_image_upload(file):
+    """Check an upload from its size and first bytes, returning (size, content type, extension).
+
+    Returns None when there is nothing to upload and raises ValueError for invalid images.
+    """
     if not file.filename or file.filename == '':
         logger.warning("No filename provided")
         return None
-    
-    # Read the file content to check if it's empty
-    file_content = file.read()
-    if len(file_content) == 0:
+
+    # Only the header and the size are inspected; the body is never read into memory
+    size = upload_size(file)
+    if size == 0:
         logger.warning("Empty file provided")
         return None
-    
-    # Reset file pointer to beginning for upload
-    file.seek(0)
-    
+    if size > MAX_UPLOAD_BYTES:
+        logger.warning(f"Image too large: {size} bytes")
+        raise ValueError(f"Image must be at most {MAX_UPLOAD_BYTES} bytes")
+
+    detected = sniff_image(file)
+    if detected is None:
+        logger.warning(f"Unrecognized image content: {file.filename}")
+        raise ValueError("Unsupported image type")
+    content_type, extensions = detected
+
+    # For files with no extension (like 'image' from form) use the detected type
+    file_extension = os.path.splitext(file.filename)[1].lower()
+    if not file_extension:
+        file_extension = extensions[0]
+    elif file_extension not in extensions:
+        logger.warning(f"Extension {file_extension} does not match {content_type} content")
+        raise ValueError("Image extension does not match its content")
+    return size, content_type, file_extension
+
+@xray_recorder.capture('s3_image_upload')
+def upload_image(fileobj, image_key, content_type):
+    """Stream an image to S3; large images go up as a multipart upload with parts sent concurrently"""
+    s3.upload_fileobj(
+        fileobj,
+        BUCKET_NAME,
+        image_key,
+        ExtraArgs={'ContentType': content_type},
+        Config=UPLOAD_TRANSFER_CONFIG
+    )
+
+def handle_image_upload(file):
+    """Validate an upload and stream it to S3, raising ValueError for invalid images"""
+    image = validate_image_upload(file)
+    if image is None:
+        return None
+    size, content_type, file_extension = image
+
     try:
-        # For files with no extension (like 'image' from form)
-        file_extension = os.path.splitext(file.filename)[1].lower()
-        if not file_extension and file.filename == 'image':
-            file_extension = '.jpg'
-            
-        unique_filename = f"{uuid.uuid4()}{file_extension}"
-        filename = f"sightings/{datetime.now().strftime('%Y%m%d')}/{unique_filename}"
-        
-        logger.info(f"Uploading image to S3: {filename}")
+        filename = new_image_key(file_extension)
         
-        # Ensure content_type is not None
-        content_type = file.content_type or 'image/jpeg'
-        
-        s3.upload_fileobj(
-            file,
-            BUCKET_NAME,
-            filename,
-            ExtraArgs={'ContentType': content_type}
-        )
+        logger.info(f"Uploading image to S3: {filename} ({size} bytes)")
+        upload_image(file.stream, filename, content_type)
         logger.info(f"Successfully uploaded image to S3: {filename}")
+        variant_pool.submit(generate_variants, filename)
         return filename
     except Exception as e:
         logger.error(f"Error uploading image: {str(e)}")
         return None
 
+def attach_image(image_key):
+    """Mark an uploaded image ready on the sightings waiting for it and queue its variants"""
+    result = db.sightings.update_many(
+        {"pending_image_key": image_key},
+        {"$set": {"image_url": image_key, "image_status": "ready", "updated_at": datetime.utcnow()}, "$unset": {"pending_image_key": ""}}
+    )
+    variant_pool.submit(generate_variants, image_key)
+    return result.modified_count
+
+def fail_pending_images(image_keys, before=None):
+    """Mark the sightings still waiting for these images as failed"""
+    query = {"pending_image_key": {"$in": image_keys}, "image_status": "pending"}
+    if before:
+        query["updated_at"] = {"$lt": before}
+    return db.sightings.update_many(
+        query,
+        {"$set": {"image_status": "failed", "updated_at": datetime.utcnow()}, "$unset": {"pending_image_key": ""}}
+    ).modified_count
+
+def delete_unreferenced_image(image_key):
+    """Delete an uploaded object unless a sighting already shows it"""
+    if db.sightings.find_one({"image_url": image_key}, {"_id": 1}) is not None:
+        logger.warning(f"Keeping expired upload {image_key}: it is referenced by a sighting")
+        return
+    try:
+        s3.delete_object(Bucket=BUCKET_NAME, Key=image_key)
+    except ClientError as e:
+        logger.warning(f"Could not delete expired upload {image_key}: {str(e)}")
+
+def expire_pending_images():
+    """Fail sightings whose image never arrived and delete whatever was uploaded for them"""
+    now = datetime.utcnow()
+    cutoff = now - timedelta(seconds=PENDING_IMAGE_EXPIRY)
+    image_keys = db.sightings.distinct(
+        'pending_image_key',
+        {"image_status": "pending", "updated_at": {"$lt": cutoff}}
+    )
+    for image_key in image_keys:
+        # Skip keys a completion attached since they were listed, so their image is kept
+        if not fail_pending_images([image_key], cutoff):
+            continue
+        logger.info(f"Expired pending upload {image_key}")
+        delete_unreferenced_image(image_key)
+
+    # Issued keys no sighting claimed in time can no longer be used, so neither can their objects;
+    # claimed keys are kept until any sighting waiting on them has expired above
+    for upload in db.uploads.find({"expires_at": {"$lt": cutoff}}):
+        if upload.get('sighting_id') is None:
+            logger.info(f"Expired unclaimed upload {upload['_id']}")
+            delete_unreferenced_image(upload['_id'])
+        db.uploads.delete_one({"_id": upload['_id']})
+
+def sweep_pending_images():
+    while True:
+        time.sleep(PENDING_IMAGE_SWEEP_INTERVAL)
+        try:
+            with xray_recorder.in_segment('pending_image_sweep'):
+                expire_pending_images()
+        except Exception as e:
+            logger.warning(f"Pending image sweep failed: {str(e)}")
+
+threading.Thread(target=sweep_pending_images, name='pending-image-sweep', daemon=True).start()
+
+# Asynchronous image upload settings
+SIGHTING_ASYNC_UPLOADS = os.getenv('SIGHTING_ASYNC_UPLOADS', 'false').lower() == 'true'
+SIGHTING_UPLOAD_WORKERS = int(os.getenv('SIGHTING_UPLOAD_WORKERS', '4'))
+SIGHTING_UPLOAD_QUEUE_MAX = int(os.getenv('SIGHTING_UPLOAD_QUEUE_MAX', '64'))
+SIGHTING_UPLOAD_ATTEMPTS = int(os.getenv('SIGHTING_UPLOAD_ATTEMPTS', '3'))
+UPLOAD_SPOOL_DIR = os.getenv('UPLOAD_SPOOL_DIR', os.path.join(tempfile.gettempdir(), 'wildlife-upload-spool'))
+# Spool files younger than this may belong to another worker process that is still using them
+UPLOAD_SPOOL_STALE_SECONDS = int(os.getenv('UPLOAD_SPOOL_STALE_SECONDS', '600'))
+# Image state is only ever set by this service, never taken from the submitted form
+SERVER_IMAGE_FIELDS = ('pending_image_key', 'image_status', 'image_url')
+
+upload_pool = ThreadPoolExecutor(max_workers=SIGHTING_UPLOAD_WORKERS, thread_name_prefix='sighting-uploads')
+# Bounds spooled uploads in flight; when none are free the request uploads synchronously instead
+upload_slots = threading.BoundedSemaphore(SIGHTING_UPLOAD_QUEUE_MAX)
+
+def spool_image(file):
+    """Copy an upload into the spool directory so it outlives the request, returning its spool id"""
+    spool_id = uuid.uuid4().hex
+    path = os.path.join(UPLOAD_SPOOL_DIR, f"{spool_id}.data")
+    with open(f"{path}.part", 'wb') as spool_file:
+        shutil.copyfileobj(file.stream, spool_file, IMAGE_CHUNK_SIZE)
+    os.replace(f"{path}.part", path)
+    return spool_id
+
+def commit_spool(spool_id, image_key, content_type):
+    """Record the upload job next to its data; only committed jobs are recovered after a restart"""
+    path = os.path.join(UPLOAD_SPOOL_DIR, f"{spool_id}.json")
+    with open(f"{path}.part", 'w') as job_file:
+        json.dump({"image_key": image_key, "content_type": content_type}, job_file)
+    os.replace(f"{path}.part", path)
+
+def discard_spool(spool_id):
+    for suffix in ('.data', '.json', '.claimed'):
+        try:
+            os.remove(os.path.join(UPLOAD_SPOOL_DIR, f"{spool_id}{suffix}"))
+        except OSError:
+            pass
+
+def process_spooled_upload(spool_id, holds_slot=True):
+    """Upload a spooled image to S3 and attach it to its sighting (runs on the upload pool)"""
+    job_path = os.path.join(UPLOAD_SPOOL_DIR, f"{spool_id}.json")
+    claimed_path = os.path.join(UPLOAD_SPOOL_DIR, f"{spool_id}.claimed")
+    try:
+        # Renaming claims the job, so only one worker process picks up a recovered upload
+        try:
+            os.rename(job_path, claimed_path)
+        except FileNotFoundError:
+            return
+        with open(claimed_path) as job_file:
+            job = json.load(job_file)
+
+        for attempt in range(SIGHTING_UPLOAD_ATTEMPTS):
+            try:
+                with open(os.path.join(UPLOAD_SPOOL_DIR, f"{spool_id}.data"), 'rb') as data_file:
+                    with xray_recorder.in_segment('sighting_async_upload'):
+                        upload_image(data_file, job['image_key'], job['content_type'])
+                attach_image(job['image_key'])
+                logger.info(f"Asynchronous upload completed: {job['image_key']}")
+                break
+            except Exception as e:
+                logger.warning(f"Asynchronous upload failed (attempt {attempt+1}/{SIGHTING_UPLOAD_ATTEMPTS}): {str(e)}")
+                if attempt < SIGHTING_UPLOAD_ATTEMPTS - 1:
+                    time.sleep(2 ** attempt)
+        else:
+            logger.error(f"Giving up on asynchronous upload: {job['image_key']}")
+            db.sightings.update_many({"pending_image_key": job['image_key']}, {"$set": {"image_status": "failed", "updated_at": datetime.utcnow()}})
+        discard_spool(spool_id)
+    except Exception as e:
+        logger.error(f"Error processing spooled upload {spool_id}: {str(e)}")
+    finally:
+        if holds_slot:
+            upload_slots.release()
+
+def recover_spooled_uploads():
+    """Resubmit uploads committed before the last shutdown and clear partial spool files"""
+    os.makedirs(UPLOAD_SPOOL_DIR, exist_ok=True)
+    now = time.time()
+
+    def is_stale(name):
+        try:
+            return now - os.path.getmtime(os.path.join(UPLOAD_SPOOL_DIR, name)) > UPLOAD_SPOOL_STALE_SECONDS
+        except OSError:
+            return False
+
+    committed = set()
+    for name in os.listdir(UPLOAD_SPOOL_DIR):
+        spool_id, suffix = os.path.splitext(name)
+        if suffix == '.json':
+            committed.add(spool_id)
+        elif suffix == '.claimed' and is_stale(name):
+            # Claimed by a process that stopped before finishing
+            os.replace(os.path.join(UPLOAD_SPOOL_DIR, name), os.path.join(UPLOAD_SPOOL_DIR, f"{spool_id}.json"))
+            committed.add(spool_id)
+    for name in os.listdir(UPLOAD_SPOOL_DIR):
+        spool_id = name.split('.')[0]
+        if spool_id not in committed and not name.endswith('.claimed') and is_stale(name):
+            discard_spool(spool_id)
+            try:
+                os.remove(os.path.join(UPLOAD_SPOOL_DIR, name))
+            except OSError:
+                pass
+    for spool_id in committed:
+        logger.info(f"Recovering spooled upload {spool_id}")
+        upload_pool.submit(process_spooled_upload, spool_id, False)
+
+recover_spooled_uploads()
+
+def stream_s3_body(response, cache_writer=None):
+    """Relay an S3 GetObject response in chunks without reading the whole body into memory"""
+    body = response['Body']
+
+    def generate():
+        complete = False
+        try:
+            for chunk in body.iter_chunks(IMAGE_CHUNK_SIZE):
+                if cache_writer is not None:
+                    cache_writer.write(chunk)
+                yield chunk
+            complete = True
+        finally:
+            body.close()
+            if cache_writer is not None:
+                if complete:
+                    cache_writer.commit()
+                else:
+                    cache_writer.abort()
+
+    headers = {
+        'Content-Length': str(response['ContentLength']),
+        'Accept-Ranges': 'bytes'
+    }
+    if response.get('ContentRange'):
+        headers['Content-Range'] = response['ContentRange']
+    if response.get('ETag'):
+        headers['ETag'] = response['ETag']
+    if response.get('LastModified'):
+        headers['Last-Modified'] = http_date(response['LastModified'])
+    # S3 answers 206 when a range was requested
+    status = response['ResponseMetadata']['HTTPStatusCode']
+    return Response(generate(), status=status, headers=headers,
+                    mimetype=response.get('ContentType', 'image/jpeg'))
+
 @app.route('/wildlife/health')
 def health_check():
     logger.info("Health check requested")
@@ -143,25 +778,190 @@ def get_image(image_key):
         logger.warning(f"Invalid file type: {image_key}")
         return jsonify({"error": "Invalid file type"}), 400
 
+    size = request.args.get('size', 'original')
+    if size != 'original' and size not in IMAGE_VARIANTS:
+        logger.warning(f"Invalid image size: {size}")
+        return jsonify({"error": "Invalid image size"}), 400
+    s3_key = image_key if size == 'original' else variant_key(image_key, size)
+
     try:
-        logger.info(f"Getting image from S3: {image_key}")
-        response = s3.get_object(Bucket=BUCKET_NAME, Key=image_key)
-        return send_file(
-            BytesIO(response['Body'].read()),
-            mimetype=response.get('ContentType', 'image/jpeg'),
-            as_attachment=False
-        )
+        if request.args.get('presigned') == 'true':
+            return redirect_to_presigned_image(image_key, size, s3_key)
+
+        cached = image_cache.get(s3_key)
+        if cached is not None:
+            level, source, meta = cached
+            logger.info(f"Serving image from {level} cache: {s3_key}")
+            try:
+                return send_cached_image(level, source, meta)
+            except FileNotFoundError:
+                image_cache.discard(s3_key)
+
+        logger.info(f"Getting image from S3: {s3_key}")
+        get_args = {'Bucket': BUCKET_NAME, 'Key': s3_key}
+        range_header = request.headers.get('Range', '').replace(' ', '')
+        if RANGE_PATTERN.match(range_header):
+            get_args['Range'] = range_header
+        if request.headers.get('If-None-Match'):
+            get_args['IfNoneMatch'] = request.headers['If-None-Match']
+        try:
+            response = s3.get_object(**get_args)
+        except ClientError as e:
+            if size == 'original' or e.response.get('Error', {}).get('Code') != 'NoSuchKey':
+                raise
+            # Variant not generated yet (older upload or pool still busy)
+            body, meta = generate_variant_on_demand(image_key, size)
+            return send_cached_image('memory', body, meta)
+
+        # Only complete objects are cached; ranged reads pass straight through
+        cache_writer = None
+        if response['ResponseMetadata']['HTTPStatusCode'] == 200:
+            cache_writer = image_cache.writer(s3_key, {
+                'size': response['ContentLength'],
+                'etag': response.get('ETag', '').strip('"'),
+                'content_type': response.get('ContentType', 'image/jpeg'),
+                'last_modified': response.get('LastModified')
+            })
+        return stream_s3_body(response, cache_writer)
     except ClientError as e:
         error_code = e.response.get('Error', {}).get('Code', 'Unknown')
         if error_code == 'NoSuchKey':
             logger.warning(f"Image not found: {image_key}")
             return jsonify({"error": "Image not found"}), 404
+        if error_code in ('304', 'NotModified'):
+            return Response(status=304, headers={'ETag': request.headers['If-None-Match']})
+        if error_code == 'InvalidRange':
+            logger.warning(f"Unsatisfiable range for image: {image_key}")
+            return jsonify({"error": "Requested range not satisfiable"}), 416
         logger.error(f"Failed to retrieve image: {str(e)}")
         return jsonify({"error": "Failed to retrieve image"}), 500
     except Exception as e:
         logger.error(f"Internal server error: {str(e)}")
         return jsonify({"error": "Internal server error"}), 500
 
+def redirect_to_presigned_image(image_key, size, s3_key):
+    """Send the client straight to S3 with a short-lived presigned GET URL"""
+    if size != 'original':
+        try:
+            s3.head_object(Bucket=BUCKET_NAME, Key=s3_key)
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') not in ('404', 'NoSuchKey'):
+                raise
+            body, meta = generate_variant_on_demand(image_key, size)
+            return send_cached_image('memory', body, meta)
+    url = s3.generate_presigned_url(
+        'get_object',
+        Params={'Bucket': BUCKET_NAME, 'Key': s3_key},
+        ExpiresIn=PRESIGNED_URL_EXPIRY
+    )
+    return redirect(url, code=302)
+
+@app.route('/wildlife/api/uploads', methods=['POST'])
+def create_upload():
+    """Issue a presigned PUT URL so the client uploads image bytes directly to S3"""
+    data = request.get_json(silent=True) or {}
+    content_type = data.get('content_type')
+    if content_type not in UPLOAD_CONTENT_TYPES:
+        logger.warning(f"Invalid upload content type: {content_type}")
+        return jsonify({"error": "Invalid content type"}), 400
+    try:
+        size = int(data.get('size'))
+    except (TypeError, ValueError):
+        return jsonify({"error": "Invalid size"}), 400
+    if not 0 < size <= MAX_UPLOAD_BYTES:
+        return jsonify({"error": f"Image must be between 1 and {MAX_UPLOAD_BYTES} bytes"}), 400
+
+    try:
+        image_key = new_image_key(UPLOAD_CONTENT_TYPES[content_type])
+        logger.info(f"Issuing presigned upload for {image_key}")
+        # Only keys recorded here can be claimed by a sighting, never one already used elsewhere
+        now = datetime.utcnow()
+        db.uploads.insert_one({
+            "_id": image_key,
+            "content_type": content_type,
+            "size": size,
+            "created_at": now,
+            "expires_at": now + timedelta(seconds=PENDING_IMAGE_EXPIRY),
+            "sighting_id": None,
+            "completed_at": None
+        })
+        # Content type and length are signed, so S3 rejects a PUT that does not match them
+        upload_url = s3.generate_presigned_url(
+            'put_object',
+            Params={'Bucket': BUCKET_NAME, 'Key': image_key, 'ContentType': content_type, 'ContentLength': size},
+            ExpiresIn=PRESIGNED_URL_EXPIRY
+        )
+        return jsonify({
+            "image_key": image_key,
+            "upload_url": upload_url,
+            "method": "PUT",
+            "headers": {"Content-Type": content_type},
+            "expires_in": PRESIGNED_URL_EXPIRY
+        }), 200
+    except Exception as e:
+        logger.error(f"Error creating upload: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/wildlife/api/uploads/complete', methods=['POST'])
+def complete_upload():
+    """Verify a direct upload landed in S3 and attach it to the sightings waiting for it"""
+    image_key = (request.get_json(silent=True) or {}).get('image_key', '')
+    if not UPLOAD_KEY_PATTERN.match(image_key):
+        logger.warning(f"Invalid upload key: {image_key}")
+        return jsonify({"error": "Invalid image key"}), 400
+
+    try:
+        upload = db.uploads.find_one({"_id": image_key})
+        if upload is None:
+            logger.warning(f"Completion for an upload that was never issued: {image_key}")
+            return jsonify({"error": "Upload not found"}), 404
+        if upload.get('completed_at') is not None:
+            return jsonify({"error": "Upload already completed"}), 409
+
+        try:
+            head = s3.head_object(Bucket=BUCKET_NAME, Key=image_key)
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey'):
+                return jsonify({"error": "Upload not found"}), 404
+            raise
+        if head['ContentLength'] > MAX_UPLOAD_BYTES or head.get('ContentType') not in UPLOAD_CONTENT_TYPES:
+            logger.warning(f"Rejecting upload that does not match its constraints: {image_key}")
+            s3.delete_object(Bucket=BUCKET_NAME, Key=image_key)
+            return jsonify({"error": "Upload does not match size or content type constraints"}), 400
+
+        # The signed content type is only what the client claimed; check the bytes that actually arrived
+        body = s3.get_object(Bucket=BUCKET_NAME, Key=image_key, Range='bytes=0-15')['Body']
+        try:
+            detected = identify_image(body.read())
+        finally:
+            body.close()
+        if detected is None or detected[0] != head['ContentType'] or os.path.splitext(image_key)[1] not in detected[1]:
+            logger.warning(f"Rejecting upload whose content is not a {head['ContentType']} image: {image_key}")
+            s3.delete_object(Bucket=BUCKET_NAME, Key=image_key)
+            fail_pending_images([image_key])
+            return jsonify({"error": "Unsupported image type"}), 400
+
+        # Concurrent completions of the same key: only the first attaches it
+        if db.uploads.find_one_and_update(
+            {"_id": image_key, "completed_at": None},
+            {"$set": {"completed_at": datetime.utcnow()}}
+        ) is None:
+            return jsonify({"error": "Upload already completed"}), 409
+        updated = attach_image(image_key)
+        logger.info(f"Completed upload {image_key} for {updated} sightings")
+        return jsonify({
+            "message": "Upload completed",
+            "image_key": image_key,
+            "sightings_updated": updated
+        }), 200
+    except Exception as e:
+        logger.error(f"Error completing upload: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/wildlife/api/media/cache', methods=['GET'])
+def get_image_cache_metrics():
+    return jsonify(image_cache.snapshot()), 200
+
 @app.route('/wildlife/api/sightings', methods=['POST'])
 def report_sighting():
     if not request.form:
@@ -171,43 +971,138 @@ def report_sighting():
     try:
         logger.info("Processing sighting report")
         data = request.form.to_dict()
+        for field in SERVER_IMAGE_FIELDS:
+            if data.pop(field, None) is not None:
+                logger.warning(f"Ignoring client supplied {field}")
         
         # Convert coordinates to float
-        for coord in ['latitude', 'longitude']:
+        for coord, limit in [('latitude', 90), ('longitude', 180)]:
             if coord in data:
                 try:
                     data[coord] = float(data[coord])
                 except ValueError:
                     logger.warning(f"Invalid {coord}")
                     return jsonify({"error": f"Invalid {coord}"}), 400
+                if not -limit <= data[coord] <= limit:
+                    logger.warning(f"Out of range {coord}")
+                    return jsonify({"error": f"Invalid {coord}"}), 400
+        
+        # Store a GeoJSON point for the 2dsphere index used by map queries
+        if 'latitude' in data and 'longitude' in data:
+            data['location'] = {"type": "Point", "coordinates": [data['longitude'], data['latitude']]}
         
         # Add timestamp
         data['timestamp'] = datetime.utcnow()
+        # Every write stamps updated_at so delta sync clients pick the change up
+        data['updated_at'] = data['timestamp']
+        
+        # Image uploaded directly to S3: wait for the completion call to attach it
+        pending_image_key = data.pop('image_key', None)
+        if pending_image_key:
+            if not UPLOAD_KEY_PATTERN.match(pending_image_key):
+                logger.warning(f"Invalid image key: {pending_image_key}")
+                return jsonify({"error": "Invalid image key"}), 400
+            data['pending_image_key'] = pending_image_key
+            data['image_status'] = 'pending'
         
         # Handle image upload
+        spooled = None
         if 'image' in request.files:
             logger.info("Processing image upload")
-            image_url = handle_image_upload(request.files['image'])
-            if image_url:
-                data['image_url'] = image_url
-                logger.info(f"Image URL set to: {image_url}")
+            file = request.files['image']
+            try:
+                image = validate_image_upload(file)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            if image and SIGHTING_ASYNC_UPLOADS and upload_slots.acquire(blocking=False):
+                # Spool to local disk and upload after responding, so S3 latency is off the request path
+                _, content_type, file_extension = image
+                image_key = new_image_key(file_extension)
+                try:
+                    spooled = (spool_image(file), image_key, content_type)
+                except Exception:
+                    upload_slots.release()
+                    raise
+                data['pending_image_key'] = image_key
+                data['image_status'] = 'pending'
+                logger.info(f"Image spooled for asynchronous upload: {image_key}")
+            elif image:
+                image_url = handle_image_upload(file)
+                if image_url:
+                    data['image_url'] = image_url
+                    data['image_status'] = 'ready'
+                    logger.info(f"Image URL set to: {image_url}")
         
+        # Assign the public id up front so it is indexed from the first write (and never taken from the form)
+        data['_id'] = ObjectId()
+        data['id'] = str(data['_id'])
+
+        # A direct upload key must have been issued by create_upload and not claimed by another sighting
+        claimed = None
+        if pending_image_key and data.get('pending_image_key') == pending_image_key:
+            claimed = db.uploads.find_one_and_update(
+                {"_id": pending_image_key, "sighting_id": None, "expires_at": {"$gt": data['timestamp']}},
+                {"$set": {"sighting_id": data['id']}},
+                return_document=ReturnDocument.AFTER
+            )
+            if claimed is None:
+                logger.warning(f"Image key not issued or already claimed: {pending_image_key}")
+                return jsonify({"error": "Invalid image key"}), 400
+
         # Store in MongoDB
         logger.info("Storing sighting in MongoDB")
-        db.sightings.insert_one(data)
+        try:
+            db.sightings.insert_one(data)
+        except Exception:
+            if spooled:
+                discard_spool(spooled[0])
+                upload_slots.release()
+            if claimed:
+                db.uploads.update_one({"_id": pending_image_key, "sighting_id": data['id']}, {"$set": {"sighting_id": None}})
+            raise
+
+        if spooled:
+            commit_spool(*spooled)
+            upload_pool.submit(process_spooled_upload, spooled[0])
+        elif claimed and db.uploads.find_one({"_id": pending_image_key, "completed_at": {"$ne": None}}, {"_id": 1}):
+            # The upload was completed before this sighting was stored, so nothing attached it yet
+            attach_image(pending_image_key)
+            data['image_status'] = 'ready'
         
-        return jsonify({"message": "Sighting reported successfully"}), 200
+        return jsonify({
+            "message": "Sighting reported successfully",
+            "sighting_id": data['id'],
+            "image_status": data.get('image_status')
+        }), 200
 
     except Exception as e:
         logger.error(f"Error in report_sighting: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/wildlife/api/sightings/<sighting_id>/status', methods=['GET'])
+def get_sighting_status(sighting_id):
+    try:
+        try:
+            query = {"_id": ObjectId(sighting_id)}
+        except InvalidId:
+            return jsonify({"error": "Invalid sighting id"}), 400
+        sighting = db.sightings.find_one(query, {'_id': False, 'image_status': True, 'image_url': True, 'pending_image_key': True})
+        if not sighting:
+            return jsonify({"error": "Sighting not found"}), 404
+        return jsonify({
+            "sighting_id": sighting_id,
+            "image_status": sighting.get('image_status'),
+            "image_url": sighting.get('image_url')
+        }), 200
+    except Exception as e:
+        logger.error(f"Error getting sighting status: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/wildlife/api/sightings', methods=['GET'])
 def get_sightings():
     try:
         logger.info("Getting sightings from MongoDB")
-        sightings = list(db.sightings.find({}, {'_id': False}))
-        return jsonify(sightings), 200
+        return stream_documents(db.sightings.find({}, {'_id': False}))
     except Exception as e:
         logger.error(f"Error getting sightings: {str(e)}")
         return jsonify({"error": str(e)}), 500
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+
+# Measures geofence evaluation throughput of the alerts service: single-fix latency and
+# batched fixes/sec on one core, against synthetic reserve, village and road zones.
+# The index classes are loaded straight from container-app/alerts/app.py so the
+# benchmark always runs the shipped code without needing MongoDB or Flask.
+#
+# Requires numpy:
+#   BENCHMARK_CPUS=0 python3 benchmark-geofence.py
+
+import ast
+import math
+import os
+import random
+import time
+
+import numpy as np
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'container-app', 'alerts', 'app.py')
+CPUS = [int(cpu) for cpu in os.getenv('BENCHMARK_CPUS', '0').split(',')]
+SINGLE_FIXES = int(os.getenv('BENCHMARK_SINGLE_FIXES', '20000'))
+BATCH_SIZES = [int(size) for size in os.getenv('BENCHMARK_BATCH_SIZES', '100,1000,10000').split(',')]
+VILLAGES = int(os.getenv('BENCHMARK_VILLAGES', '200'))
+ROADS = int(os.getenv('BENCHMARK_ROADS', '100'))
+GRID_DEGREES = float(os.getenv('GEOFENCE_GRID_DEGREES', '0.01'))
+
+# Black River Gorges, roughly
+CENTER_LON, CENTER_LAT = 57.45, -20.40
+RESERVE_RADIUS = 0.12
+
+def load_geofence_classes():
+    """Execute only the geofence definitions from the alerts service"""
+    tree = ast.parse(open(APP_PATH).read())
+    wanted = {'ring_contains', 'GeofenceZone', 'GeofenceIndex', 'NO_ZONES', 'GEOFENCE_CHUNK_CELLS', 'GEOFENCE_MAX_ZONE_CELLS'}
+    body = [node for node in tree.body if getattr(node, 'name', None) in wanted
+            or isinstance(node, ast.Assign) and any(getattr(target, 'id', None) in wanted for target in node.targets)]
+    namespace = {'np': np, 'math': math, 'os': os}
+    exec(compile(ast.Module(body=body, type_ignores=[]), APP_PATH, 'exec'), namespace)
+    return namespace
+
+## Synthetic zones
+
+def circle(lon, lat, radius, vertices, jitter=0.0):
+    ring = []
+    for i in range(vertices):
+        angle = 2 * math.pi * i / vertices
+        r = radius * (1 + random.uniform(-jitter, jitter))
+        ring.append([lon + r * math.cos(angle), lat + r * math.sin(angle)])
+    return ring + [ring[0]]
+
+def road(lon, lat, length, width, angle):
+    dx, dy = math.cos(angle), math.sin(angle)
+    nx, ny = -dy * width, dx * width
+    ring = [
+        [lon + nx, lat + ny],
+        [lon + dx * length + nx, lat + dy * length + ny],
+        [lon + dx * length - nx, lat + dy * length - ny],
+        [lon - nx, lat - ny]
+    ]
+    return ring + [ring[0]]
+
+def build_zones(ns):
+    Zone = ns['GeofenceZone']
+    zones = [Zone('reserve', 'Reserve boundary', 'reserve', {
+        'type': 'Polygon', 'coordinates': [circle(CENTER_LON, CENTER_LAT, RESERVE_RADIUS, 2000, jitter=0.05)]
+    })]
+    for i in range(VILLAGES):
+        lon = CENTER_LON + random.uniform(-0.25, 0.25)
+        lat = CENTER_LAT + random.uniform(-0.25, 0.25)
+        zones.append(Zone(f'village-{i}', f'Village {i}', 'village', {
+            'type': 'Polygon', 'coordinates': [circle(lon, lat, random.uniform(0.002, 0.008), 64)]
+        }))
+    for i in range(ROADS):
+        lon = CENTER_LON + random.uniform(-0.25, 0.25)
+        lat = CENTER_LAT + random.uniform(-0.25, 0.25)
+        zones.append(Zone(f'road-{i}', f'Road {i}', 'road', {
+            'type': 'Polygon', 'coordinates': [road(lon, lat, random.uniform(0.02, 0.08), 0.0005, random.uniform(0, math.pi))]
+        }))
+    return zones
+
+def random_fixes(count):
+    lons = CENTER_LON + np.random.uniform(-0.25, 0.25, count)
+    lats = CENTER_LAT + np.random.uniform(-0.25, 0.25, count)
+    return lons, lats
+
+## Benchmarks
+
+def bench_single(index):
+    lons, lats = random_fixes(SINGLE_FIXES)
+    latencies = []
+    for lon, lat in zip(lons.tolist(), lats.tolist()):
+        start = time.perf_counter()
+        index.locate([lon], [lat])
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    percentile = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1e6
+    print(f"single fix: p50={percentile(0.5):.0f}us p99={percentile(0.99):.0f}us "
+          f"fixes/s={len(latencies) / sum(latencies):.0f}")
+
+def bench_batches(index):
+    print(f"{'batch':>8} {'ms/batch':>10} {'us/fix':>8} {'fixes/s':>10}")
+    for size in BATCH_SIZES:
+        lons, lats = random_fixes(size)
+        rounds = max(3, 50000 // size)
+        start = time.perf_counter()
+        for _ in range(rounds):
+            index.locate(lons, lats)
+        elapsed = (time.perf_counter() - start) / rounds
+        print(f"{size:>8} {elapsed * 1000:>10.2f} {elapsed * 1e6 / size:>8.1f} {size / elapsed:>10.0f}")
+
+def bench_brute_force(zones):
+    """Baseline: every fix tested against every zone, no grid"""
+    lons, lats = random_fixes(1000)
+    start = time.perf_counter()
+    for zone in zones:
+        zone.contains(lons, lats)
+    elapsed = time.perf_counter() - start
+    print(f"no index, 1000 fixes: {elapsed * 1000:.1f}ms ({1000 / elapsed:.0f} fixes/s)")
+
+def main():
+    os.sched_setaffinity(0, CPUS)
+    random.seed(7)
+    np.random.seed(7)
+    ns = load_geofence_classes()
+    start = time.perf_counter()
+    zones = build_zones(ns)
+    index = ns['GeofenceIndex'](zones, GRID_DEGREES)
+    print(f"cpus={CPUS} zones={len(zones)} grid={GRID_DEGREES} cells={len(index.cells)} "
+          f"build={(time.perf_counter() - start) * 1000:.0f}ms")
+    bench_single(index)
+    bench_batches(index)
+    bench_brute_force(zones)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+
+# Compares requests per second of the Flask development server against gunicorn.
+# The endpoint mimics a service read: a short I/O wait for the database round trip
+# followed by JSON serialization of a page of sightings.
+#
+# Requires flask and gunicorn. Pin the servers to the vCPUs of one ECS task with BENCHMARK_CPUS:
+#   BENCHMARK_CPUS=0 python3 benchmark-serving.py
+
+import http.client
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+
+from flask import Flask, jsonify
+
+PORT = int(os.getenv('BENCHMARK_PORT', '5055'))
+CPUS = [int(cpu) for cpu in os.getenv('BENCHMARK_CPUS', '0').split(',')]
+DURATION = float(os.getenv('BENCHMARK_DURATION', '15'))
+CONCURRENCY = [int(level) for level in os.getenv('BENCHMARK_CONCURRENCY', '8,32,128').split(',')]
+IO_LATENCY = float(os.getenv('BENCHMARK_IO_LATENCY_MS', '5')) / 1000
+PAGE_SIZE = int(os.getenv('BENCHMARK_PAGE_SIZE', '50'))
+GUNICORN_WORKERS = int(os.getenv('GUNICORN_WORKERS', '2'))
+GUNICORN_THREADS = int(os.getenv('GUNICORN_THREADS', '8'))
+
+app = Flask(__name__)
+
+SIGHTINGS = [{
+    'species': random.choice(['Pink Pigeon', 'Mauritius Kestrel', 'Echo Parakeet']),
+    'habitat': 'Forest',
+    'count': str(random.randint(1, 10)),
+    'latitude': -20.2759 + random.uniform(-0.3, 0.3),
+    'longitude': 57.5704 + random.uniform(-0.3, 0.3),
+    'timestamp': datetime.utcnow()
+} for _ in range(PAGE_SIZE)]
+
+@app.route('/wildlife/api/sightings')
+def get_sightings():
+    time.sleep(IO_LATENCY)
+    return jsonify(SIGHTINGS)
+
+## Servers under test, each started in its own process pinned to the task's CPUs
+
+def serve_dev():
+    app.run(host='127.0.0.1', port=PORT)
+
+def serve_gunicorn():
+    from gunicorn.app.base import BaseApplication
+
+    class BenchmarkApplication(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', f'127.0.0.1:{PORT}')
+            self.cfg.set('worker_class', 'gthread')
+            self.cfg.set('workers', GUNICORN_WORKERS)
+            self.cfg.set('threads', GUNICORN_THREADS)
+            self.cfg.set('keepalive', 75)
+            self.cfg.set('loglevel', 'warning')
+
+        def load(self):
+            return app
+
+    BenchmarkApplication().run()
+
+SERVERS = {
+    'flask-dev': serve_dev,
+    f'gunicorn {GUNICORN_WORKERS}x{GUNICORN_THREADS}': serve_gunicorn
+}
+
+def start_server(name):
+    process = subprocess.Popen([sys.executable, __file__, '--serve', name])
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', PORT, timeout=1)
+            conn.request('GET', '/wildlife/api/sightings')
+            conn.getresponse().read()
+            conn.close()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"{name} did not start")
+
+## Closed-loop load generator: each client keeps one keep-alive connection busy
+
+def run_load(concurrency):
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    stop_at = time.monotonic() + DURATION
+
+    def client():
+        conn = http.client.HTTPConnection('127.0.0.1', PORT, timeout=30)
+        local = []
+        while time.monotonic() < stop_at:
+            start = time.perf_counter()
+            try:
+                conn.request('GET', '/wildlife/api/sightings')
+                response = conn.getresponse()
+                response.read()
+                if response.status != 200:
+                    raise OSError(response.status)
+                local.append(time.perf_counter() - start)
+            except (OSError, http.client.HTTPException):
+                with lock:
+                    errors[0] += 1
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', PORT, timeout=30)
+        conn.close()
+        with lock:
+            latencies.extend(local)
+
+    clients = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+    latencies.sort()
+    percentile = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else 0
+    return len(latencies) / DURATION, percentile(0.5), percentile(0.99), errors[0]
+
+def main():
+    print(f"cpus={CPUS} duration={DURATION:.0f}s io_latency={IO_LATENCY * 1000:.0f}ms page_size={PAGE_SIZE}")
+    print(f"{'server':>14} {'clients':>8} {'req/s':>9} {'p50 (ms)':>9} {'p99 (ms)':>9} {'errors':>7}")
+    for name in SERVERS:
+        process = start_server(name)
+        try:
+            for concurrency in CONCURRENCY:
+                rps, p50, p99, errors = run_load(concurrency)
+                print(f"{name:>14} {concurrency:>8} {rps:>9.0f} {p50:>9.1f} {p99:>9.1f} {errors:>7}")
+        finally:
+            process.terminate()
+            process.wait()
+
+if __name__ == '__main__':
+    if len(sys.argv) == 3 and sys.argv[1] == '--serve':
+        # Restrict the server (and its forked workers) to the CPUs of one task
+        os.sched_setaffinity(0, CPUS)
+        SERVERS[sys.argv[2]]()
+    else:
+        main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+# Compares buffered vs streamed JSON serialization of a MongoDB collection.
+# Reports time-to-first-byte, total time and peak RSS at several collection sizes.
+#
+# Requires a local mongod plus flask and pymongo:
+#   MONGO_URI=mongodb://localhost:27017 python3 benchmark-streaming.py
+
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+
+from flask import Flask, jsonify
+from pymongo import MongoClient
+
+MONGO_URI = os.getenv('MONGO_URI', 'mongodb://localhost:27017')
+SIZES = [int(size) for size in os.getenv('BENCHMARK_SIZES', '10000,100000,1000000').split(',')]
+BATCH_SIZE = int(os.getenv('STREAM_BATCH_SIZE', '500'))
+DB_NAME = 'wildlife_benchmark'
+
+app = Flask(__name__)
+
+## Seed the benchmark collection
+
+def seed(collection, count):
+    if collection.estimated_document_count() == count:
+        return
+    collection.drop()
+    start = datetime.utcnow()
+    batch = []
+    for i in range(count):
+        batch.append({
+            'species': random.choice(['Pink Pigeon', 'Mauritius Kestrel', 'Echo Parakeet']),
+            'habitat': 'Forest',
+            'count': str(random.randint(1, 10)),
+            'latitude': -20.2759 + random.uniform(-0.3, 0.3),
+            'longitude': 57.5704 + random.uniform(-0.3, 0.3),
+            'timestamp': start - timedelta(seconds=i)
+        })
+        if len(batch) == 10000:
+            collection.insert_many(batch)
+            batch = []
+    if batch:
+        collection.insert_many(batch)
+
+## Serializers under test (mirrors the service code)
+
+def buffered(cursor):
+    sightings = list(cursor)
+    yield jsonify(sightings).get_data()
+
+def streamed(cursor):
+    cursor = cursor.batch_size(BATCH_SIZE)
+    yield '['
+    separator = ''
+    batch = []
+    for doc in cursor:
+        batch.append(app.json.dumps(doc))
+        if len(batch) >= BATCH_SIZE:
+            yield separator + ','.join(batch)
+            separator = ','
+            batch = []
+    if batch:
+        yield separator + ','.join(batch)
+    yield ']'
+
+## Run one measurement in a fresh process so peak RSS is not shared
+
+def run_child(mode, count):
+    collection = MongoClient(MONGO_URI)[DB_NAME][f'sightings_{count}']
+    serializer = buffered if mode == 'buffered' else streamed
+    with app.app_context():
+        start = time.perf_counter()
+        ttfb = None
+        size = 0
+        for chunk in serializer(collection.find({}, {'_id': False})):
+            if ttfb is None:
+                ttfb = time.perf_counter() - start
+            size += len(chunk)
+        total = time.perf_counter() - start
+    # ru_maxrss is reported in kilobytes on Linux
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({'ttfb': ttfb, 'total': total, 'bytes': size, 'peak_rss_mb': peak_rss_mb}))
+
+def main():
+    collections = MongoClient(MONGO_URI)[DB_NAME]
+    print(f"{'documents':>10} {'mode':>9} {'ttfb (ms)':>10} {'total (s)':>10} {'peak rss (MB)':>14}")
+    for count in SIZES:
+        seed(collections[f'sightings_{count}'], count)
+        for mode in ('buffered', 'streamed'):
+            output = subprocess.run(
+                [sys.executable, __file__, '--child', mode, str(count)],
+                capture_output=True, text=True, check=True
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{count:>10} {mode:>9} {result['ttfb'] * 1000:>10.1f} "
+                  f"{result['total']:>10.2f} {result['peak_rss_mb']:>14.1f}")
+
+if __name__ == '__main__':
+    if len(sys.argv) == 4 and sys.argv[1] == '--child':
+        run_child(sys.argv[2], int(sys.argv[3]))
+    else:
+        main()